@@ -165,3 +165,41 @@ def test_cli_nonexistent_file():
     # Should output an error message
     error_output = err.getvalue()
     assert "Error:" in error_output
+
+
+def test_cli_input_error_keeps_output(caplog):
+    """Test that an input error leaves an existing output file untouched."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "out.cypher")
+        with open(output_path, "w") as f:
+            f.write("CREATE (n);\n")
+
+        broken = os.path.join(tmp_dir, "broken.yaml")
+        with open(broken, "w") as f:
+            f.write("nodes: [unclosed\n")
+        dangling = os.path.join(tmp_dir, "dangling.yaml")
+        with open(dangling, "w") as f:
+            yaml.dump(
+                {"relationships": [{"from": "a", "to": "b", "type": "T"}]},
+                f,
+            )
+        empty = os.path.join(tmp_dir, "empty.yaml")
+        open(empty, "w").close()
+
+        for args in (
+            [broken, "-o", output_path],
+            [empty, "-o", output_path],
+            [dangling, "-o", output_path, "--strict-references"],
+        ):
+            with captured_output() as (out, err):
+                assert main(args) != 0
+            assert "Error:" in err.getvalue()
+            assert "Error writing Cypher" not in caplog.text
+            with open(output_path) as f:
+                assert f.read() == "CREATE (n);\n"
+        assert sorted(os.listdir(tmp_dir)) == [
+            "broken.yaml",
+            "dangling.yaml",
+            "empty.yaml",
+            "out.cypher",
+        ]
@@ -0,0 +1,94 @@
+import pytest
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.compact import plan_chunks
+
+
+@pytest.fixture
+def graph():
+    """Two small components and an isolated node."""
+    return {
+        "nodes": {
+            "p1": {"labels": "Person", "name": "John"},
+            "p2": {"labels": "Person"},
+            "c1": {"labels": ["Company", "Org"]},
+            "x": {},
+        },
+        "relationships": [
+            {"from": "p1", "to": "c1", "type": "WORKS_FOR", "since": 2015},
+            {"from": "p2", "to": "p1", "type": "KNOWS"},
+        ],
+    }
+
+
+def test_components_packed_together(graph):
+    """Test that whole components share a chunk when they fit."""
+    plan = plan_chunks(graph, 5)
+    assert [chunk.nodes for chunk in plan.chunks] == [
+        ["p1", "p2", "c1"],
+        ["x"],
+    ]
+    assert len(plan.chunks[0].relationships) == 2
+    assert plan.cut_edges == []
+
+    plan = plan_chunks(graph, 6)
+    assert len(plan.chunks) == 1
+
+
+def test_oversized_component_split():
+    """Test that large components are split with a strict size bound."""
+    data = {
+        "nodes": {f"n{i}": {} for i in range(10)},
+        "relationships": [
+            {"from": f"n{i}", "to": f"n{i + 1}", "type": "NEXT"}
+            for i in range(9)
+        ]
+        + [{"from": "n0", "to": "n0", "type": "SELF"}],
+    }
+    plan = plan_chunks(data, 4)
+    assert all(len(chunk) <= 4 for chunk in plan.chunks)
+
+    chunk_of = {
+        node_id: i
+        for i, chunk in enumerate(plan.chunks)
+        for node_id in chunk.nodes
+    }
+    assert sorted(chunk_of) == sorted(data["nodes"])
+    for i, chunk in enumerate(plan.chunks):
+        for rel in chunk.relationships:
+            assert chunk_of[rel["from"]] == chunk_of[rel["to"]] == i
+    placed = sum(len(chunk.relationships) for chunk in plan.chunks)
+    assert placed + len(plan.cut_edges) == 10
+
+    with pytest.raises(ValueError):
+        plan_chunks(data, 0)
+
+
+def test_compact_statements(graph):
+    """Test coalesced CREATE statements and MATCH for cut edges."""
+    converter = YAML2Cypher({"mode": "compact", "batch_size": 3})
+    statements = converter.convert_yaml_to_cypher(graph)
+
+    assert statements == [
+        "CREATE (p1:Person {_id: 'p1', name: 'John'}), "
+        "(c1:Company:Org {_id: 'c1'}), "
+        "(p1)-[:WORKS_FOR {since: 2015}]->(c1)",
+        "CREATE (p2:Person {_id: 'p2'}), (x {_id: 'x'})",
+        "CREATE INDEX IF NOT EXISTS FOR (n:Person) ON (n._id)",
+        "UNWIND [{from: 'p2', to: 'p1', props: {}}] AS row "
+        "MATCH (a:Person {_id: row.from}) "
+        "MATCH (b:Person {_id: row.to}) "
+        "CREATE (a)-[r:KNOWS]->(b) SET r += row.props",
+    ]
+
+
+def test_compact_records_match_graph(graph):
+    """Test that streamed records are coalesced like parsed graphs."""
+    records = [
+        {"id": node_id, **node_data}
+        for node_id, node_data in graph["nodes"].items()
+    ] + graph["relationships"]
+    converter = YAML2Cypher({"mode": "compact"})
+    assert list(converter.convert_records(records)) == (
+        converter.convert_yaml_to_cypher(graph)
+    )
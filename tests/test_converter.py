@@ -206,3 +206,42 @@ def test_write_cypher_to_file(converter, sample_yaml_data):
     finally:
         if os.path.exists(output_path):
             os.unlink(output_path)
+
+
+def test_vector_properties():
+    """Test vecf32 formatting of vector properties."""
+    from array import array
+
+    converter = YAML2Cypher(
+        {"vector_properties": ["embedding"], "vector_precision": 3}
+    )
+    node_data = {"labels": "Doc", "embedding": [0.12345, 1, -2.5e-7]}
+    assert (
+        converter._convert_node("d1", node_data)
+        == "CREATE (d1:Doc {embedding: vecf32([0.123, 1, -2.5e-07])})"
+    )
+
+    # Hinted lists with non-numeric elements name the property
+    for bad in ([0.5, None], [0.5, "x"]):
+        with pytest.raises(ValueError, match="'embedding'"):
+            converter._generate_node_properties({"embedding": bad})
+        merge = YAML2Cypher(
+            {"mode": "merge", "vector_properties": ["embedding"]}
+        )
+        with pytest.raises(ValueError, match="'embedding'"):
+            merge.convert_yaml_to_cypher(
+                {"nodes": {"d1": {"labels": "Doc", "embedding": bad}}}
+            )
+
+    # Lists that are not hinted stay plain Cypher lists
+    assert (
+        converter._generate_node_properties({"scores": [0.5, 1.5]})
+        == "{scores: [0.5, 1.5]}"
+    )
+
+    # Float arrays are recognised by type
+    converter = YAML2Cypher()
+    assert (
+        converter._format_property_value(array("f", [0.5, 0.25]))
+        == "vecf32([0.5, 0.25])"
+    )
@@ -0,0 +1,213 @@
+import csv
+import json
+import os
+import tempfile
+
+import pytest
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.csv_export import CSVExporter, format_csv_value
+from yaml2cypher.index import DanglingReferenceError
+
+
+@pytest.fixture
+def graph():
+    """Graph data with typed, list and nested properties."""
+    return {
+        "nodes": {
+            "p1": {
+                "labels": ["Person", "Employee"],
+                "name": "John",
+                "age": 30,
+                "active": True,
+                "tags": ["a", "b"],
+            },
+            "p2": {
+                "labels": ["Person", "Employee"],
+                "name": "Jane, Jr.",
+                "score": 1.5,
+                "meta": {"k": 1},
+            },
+            "c1": {"labels": "Company", "name": "ACME"},
+        },
+        "relationships": [
+            {"from": "p1", "to": "c1", "type": "WORKS_FOR", "since": 2015},
+            {"from": "p2", "to": "c1", "type": "WORKS_FOR"},
+        ],
+    }
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_export_files(graph):
+    """Test typed headers and rows of node and relationship files."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = CSVExporter(tmp_dir, chunk_size=1).export(graph)
+        names = [os.path.basename(path) for path in files]
+        assert names == [
+            "nodes_Person_Employee.csv",
+            "nodes_Company.csv",
+            "rels_WORKS_FOR.csv",
+            "load.cypher",
+        ]
+
+        people = _read(files[0])
+        assert people[0] == [
+            "_id:ID",
+            "name:string",
+            "age:long",
+            "active:boolean",
+            "tags:string[]",
+            "score:double",
+            "meta:string",
+            ":LABEL",
+        ]
+        assert people[1] == [
+            "p1", "John", "30", "true", "a;b", "", "", "Person;Employee"
+        ]
+        assert people[2] == [
+            "p2", "Jane, Jr.", "", "", "", "1.5", '{"k": 1}',
+            "Person;Employee",
+        ]
+
+        rels = _read(files[2])
+        assert rels == [
+            [":START_ID", ":END_ID", ":TYPE", "since:long"],
+            ["p1", "c1", "WORKS_FOR", "2015"],
+            ["p2", "c1", "WORKS_FOR", ""],
+        ]
+
+
+def test_load_script(graph):
+    """Test the companion LOAD CSV script."""
+    graph["relationships"].append({"from": "c1", "to": "p1", "type": "OWNS"})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = CSVExporter(tmp_dir).export(graph)
+        with open(files[-1]) as f:
+            script = f.read().splitlines()
+
+    assert script[:3] == [
+        "CREATE INDEX IF NOT EXISTS FOR (n:Person) ON (n._id);",
+        "CREATE INDEX IF NOT EXISTS FOR (n:Employee) ON (n._id);",
+        "CREATE INDEX IF NOT EXISTS FOR (n:Company) ON (n._id);",
+    ]
+    assert script[3] == (
+        "LOAD CSV WITH HEADERS FROM 'file:///nodes_Person_Employee.csv' "
+        "AS row CREATE (n:Person:Employee {_id: row.`_id:ID`, "
+        "name: row.`name:string`, age: toInteger(row.`age:long`), "
+        "active: (row.`active:boolean` = 'true'), "
+        "tags: [v IN split(row.`tags:string[]`, ';') | v], "
+        "score: toFloat(row.`score:double`), meta: row.`meta:string`});"
+    )
+    assert script[5] == (
+        "LOAD CSV WITH HEADERS FROM 'file:///rels_WORKS_FOR.csv' AS row "
+        "MATCH (a:Person {_id: row.`:START_ID`}) "
+        "MATCH (b:Company {_id: row.`:END_ID`}) "
+        "CREATE (a)-[:WORKS_FOR {since: toInteger(row.`since:long`)}]->(b);"
+    )
+    assert script[6].endswith("CREATE (a)-[:OWNS]->(b);")
+
+
+def test_colliding_file_names():
+    """Test that label sets with the same sanitized name get own files."""
+    data = {
+        "nodes": {
+            "a": {"labels": "A_B", "x": 1},
+            "b": {"labels": ["A", "B"], "y": 2},
+            "c": {"labels": "A-B"},
+        },
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = CSVExporter(tmp_dir).export(data)
+        names = [os.path.basename(path) for path in files]
+        assert names == [
+            "nodes_A_B.csv",
+            "nodes_A_B_2.csv",
+            "nodes_A-B.csv",
+            "load.cypher",
+        ]
+        assert _read(files[1])[1] == ["b", "2", "A;B"]
+        with open(files[-1]) as f:
+            script = f.read()
+    assert "'file:///nodes_A_B_2.csv' AS row CREATE (n:A:B" in script
+
+
+def test_header_types_from_all_values():
+    """Test that values past the sample still decide the header type."""
+    data = {
+        "nodes": {
+            "p1": {"labels": "Person", "age": 30},
+            "p2": {"labels": "Person", "age": "unknown"},
+        },
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        converter = YAML2Cypher({"schema_sample_size": 1})
+        files = converter.write_csv(data, tmp_dir)
+        assert _read(files[0]) == [
+            ["_id:ID", "age:string", ":LABEL"],
+            ["p1", "30", "Person"],
+            ["p2", "unknown", "Person"],
+        ]
+    assert converter.schema.drift() == ["(:Person).age: integer, string"]
+
+
+def test_format_csv_value():
+    """Test formatting of generic column values."""
+    assert format_csv_value([1, 2.5, True]) == "1;2.5;true"
+    assert format_csv_value([[1], {"a": None}]) == '[[1], {"a": null}]'
+    assert format_csv_value(None) == ""
+
+
+def test_converter_write_csv(graph):
+    """Test CSV export through the converter, including reference checks."""
+    graph["relationships"].append({"from": "p1", "to": "x9", "type": "KNOWS"})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        converter = YAML2Cypher({"merge_key": "uid"})
+        files = converter.write_csv(graph, tmp_dir)
+        assert _read(files[0])[0][0] == "uid:ID"
+        assert converter.node_index.dangling() == {"x9": [2]}
+
+        strict = YAML2Cypher({"strict_references": True})
+        with pytest.raises(DanglingReferenceError):
+            strict.write_csv(graph, tmp_dir)
+
+
+def test_write_csv_file_streams_ndjson(graph):
+    """Test that NDJSON input gives the same files as the parsed graph."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "graph.ndjson")
+        with open(path, "w") as f:
+            # Relationships first: their endpoints are only known after
+            # the type pass
+            for rel in graph["relationships"]:
+                f.write(json.dumps(rel) + "\n")
+            for node_id, node_data in graph["nodes"].items():
+                f.write(json.dumps({"id": node_id, **node_data}) + "\n")
+
+        expected = CSVExporter(os.path.join(tmp_dir, "a")).export(graph)
+        converter = YAML2Cypher({"batch_size": 1})
+        files = converter.write_csv_file(path, os.path.join(tmp_dir, "b"))
+        names = [os.path.basename(p) for p in files]
+        assert names == [os.path.basename(p) for p in expected]
+        for name in names:
+            with open(os.path.join(tmp_dir, "a", name)) as a, open(
+                os.path.join(tmp_dir, "b", name)
+            ) as b:
+                assert a.read() == b.read()
+        with open(files[-1]) as f:
+            assert "MATCH (b:Company {_id: row.`:END_ID`})" in f.read()
+
+
+def test_strict_failure_writes_nothing(graph):
+    """Test that dangling references are reported before any file."""
+    graph["relationships"].append({"from": "p1", "to": "x9", "type": "KNOWS"})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = os.path.join(tmp_dir, "out")
+        with pytest.raises(DanglingReferenceError):
+            YAML2Cypher({"strict_references": True}).write_csv(
+                graph, directory
+            )
+        assert not os.path.exists(directory)
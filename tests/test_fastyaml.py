@@ -0,0 +1,124 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher import fastyaml
+
+EXAMPLES_DIR = Path(__file__).parent / ".." / "examples"
+
+
+def _write_temp(content):
+    with tempfile.NamedTemporaryFile(
+        suffix=".yaml", delete=False, mode="w"
+    ) as f:
+        f.write(content)
+        return f.name
+
+
+@pytest.fixture
+def yaml_file():
+    """Factory writing YAML snippets to temporary files."""
+    paths = []
+
+    def make(content):
+        path = _write_temp(content)
+        paths.append(path)
+        return path
+
+    yield make
+
+    for path in paths:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+@pytest.mark.parametrize("name", ["example.yaml", "complex_graph.yaml"])
+def test_examples_scan_without_fallback(name):
+    """Test that the bundled examples are inside the supported subset."""
+    path = str(EXAMPLES_DIR / name)
+    with open(path) as f:
+        expected = yaml.safe_load(f)
+    assert fastyaml.scan_file(path) == expected
+
+
+@pytest.mark.parametrize("name", ["example.yaml", "complex_graph.yaml"])
+def test_examples_same_cypher(name):
+    """Test that the fast path produces exactly the same Cypher."""
+    path = str(EXAMPLES_DIR / name)
+    expected = YAML2Cypher().yaml_file_to_cypher(path)
+    fast = YAML2Cypher({"fast_yaml": True}).yaml_file_to_cypher(path)
+    assert fast == expected
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "a: 1\nb: -2\nc: 0.5\nd: +3\n",
+        "a: true\nb: No\nc: OFF\nd: ~\ne: null\nf:\n",
+        "a: 'It''s'\nb: \"quoted\"  # comment\nc: O'Reilly\n",
+        "a: http://example.com\nb: a#b\nc: München\n",
+        "a:\n- x\n- y\nb:\n  - 1\n  -\n  - - 2\n    - 3\n",
+        "a:\n  - k: 1\n    v: [1]\n",
+        "a:\n  b:\n    c: 1\n  d: 2\n",
+        "a: 2023-12-31\n",
+        "a: 1e3\n",
+        "a: 012\n",
+        "a: [1, 2]\n",
+        "a: &x 1\nb: *x\n",
+        "a: |\n  text\n",
+        "a: \"esc\\n\"\n",
+        "a: plain\n  continued\n",
+        "---\na: 1\n",
+        "- 1\n- 2\n",
+        "a: .inf\n",
+        "a: yes # trailing\n",
+    ],
+)
+def test_load_fast_matches_safe_load(yaml_file, content):
+    """Test that load_fast always returns what yaml.safe_load returns."""
+    path = yaml_file(content)
+    assert fastyaml.load_fast(path) == yaml.safe_load(content)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "a: [1, 2]\n",
+        "a: &x 1\n",
+        "a: !!str 1\n",
+        "a: 2023-12-31\n",
+        "a: |\n  text\n",
+        "a:\n\tb: 1\n",
+        "a: plain\n  continued\n",
+        "---\na: 1\n",
+        "",
+        "a: x\u2028\n",
+        "a: x\x85y\n",
+        "a: b\x07c\n",
+        "a: x\x00\n",
+    ],
+)
+def test_unsupported_constructs_detected(yaml_file, content):
+    """Test that constructs outside the subset are rejected."""
+    with pytest.raises(fastyaml.UnsupportedYAML):
+        fastyaml.scan_file(yaml_file(content))
+
+
+def test_fallback_same_cypher(yaml_file):
+    """Test that a file needing the fallback still converts identically."""
+    path = yaml_file(
+        "nodes:\n"
+        "  p1: {labels: Person, name: 'John'}\n"
+        "  p2:\n"
+        "    labels: Person\n"
+        "    born: 1990-01-01\n"
+        "relationships:\n"
+        "  - {from: p1, to: p2, type: KNOWS}\n"
+    )
+    expected = YAML2Cypher().yaml_file_to_cypher(path)
+    fast = YAML2Cypher({"fast_yaml": True}).yaml_file_to_cypher(path)
+    assert fast == expected
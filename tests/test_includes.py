@@ -0,0 +1,134 @@
+import os
+import tempfile
+
+import pytest
+import yaml
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.includes import IncludeCycleError
+
+
+@pytest.fixture
+def graph_dir():
+    """Directory with graph files that include each other."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        def write(name, data):
+            path = os.path.join(tmp_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                yaml.dump(data, f, sort_keys=False)
+            return path
+
+        write(
+            "shared/people.yaml",
+            {"nodes": {"p1": {"labels": "Person", "name": "John"}}},
+        )
+        write(
+            "shared/companies.yaml",
+            {"nodes": {"c1": {"labels": "Company", "name": "ACME"}}},
+        )
+        write(
+            "jobs.yaml",
+            {
+                "include": "shared/people.yaml",
+                "relationships": [
+                    {"from": "p1", "to": "c1", "type": "WORKS_FOR"}
+                ],
+            },
+        )
+        write(
+            "root.yaml",
+            {
+                "include": ["shared/*.yaml", "jobs.yaml"],
+                "nodes": {"p2": {"labels": "Person", "name": "Jane"}},
+                "relationships": [{"from": "p2", "to": "p1", "type": "KNOWS"}],
+            },
+        )
+        yield tmp_dir, write
+
+
+def test_include_merges_files(graph_dir):
+    """Test that included nodes and relationships are merged."""
+    tmp_dir, _ = graph_dir
+    converter = YAML2Cypher({"strict_references": True})
+    statements = converter.yaml_file_to_cypher(
+        os.path.join(tmp_dir, "root.yaml")
+    )
+
+    assert statements == [
+        "CREATE (c1:Company {name: 'ACME'})",
+        "CREATE (p1:Person {name: 'John'})",
+        "CREATE (p2:Person {name: 'Jane'})",
+        "CREATE (p1)-[:WORKS_FOR ]->(c1)",
+        "CREATE (p2)-[:KNOWS ]->(p1)",
+    ]
+
+
+def test_shared_file_parsed_once(graph_dir):
+    """Test that a file included by several roots is parsed once."""
+    tmp_dir, write = graph_dir
+    other_root = write(
+        "other.yaml", {"include": ["shared/people.yaml", "jobs.yaml"]}
+    )
+    converter = YAML2Cypher()
+    converter.yaml_file_to_cypher(os.path.join(tmp_dir, "root.yaml"))
+    converter.yaml_file_to_cypher(other_root)
+
+    # people.yaml, companies.yaml and jobs.yaml are each parsed once
+    assert converter.document_cache.misses == 3
+    assert converter.document_cache.hits == 2
+
+
+def test_stream_documents_share_includes(graph_dir):
+    """Test that documents of a stream merge a shared include once."""
+    tmp_dir, _ = graph_dir
+    path = os.path.join(tmp_dir, "stream.yaml")
+    with open(path, "w") as f:
+        yaml.dump_all(
+            [
+                {"include": "shared/companies.yaml"},
+                {
+                    "include": "shared/companies.yaml",
+                    "nodes": {"p3": {"labels": "Person"}},
+                },
+            ],
+            f,
+        )
+    statements = list(YAML2Cypher().stream_file_to_cypher(path))
+    assert statements == [
+        "CREATE (c1:Company {name: 'ACME'})",
+        "CREATE (p3:Person )",
+    ]
+
+
+def test_document_cache_is_bounded(graph_dir):
+    """Test that the least recently used documents are evicted."""
+    tmp_dir, _ = graph_dir
+    converter = YAML2Cypher()
+    converter.document_cache.max_entries = 2
+    converter.yaml_file_to_cypher(os.path.join(tmp_dir, "root.yaml"))
+
+    assert len(converter.document_cache) == 2
+    assert converter.included_files == {
+        os.path.join(tmp_dir, "shared", "people.yaml"),
+        os.path.join(tmp_dir, "shared", "companies.yaml"),
+        os.path.join(tmp_dir, "jobs.yaml"),
+    }
+
+
+def test_include_cycle_detected(graph_dir):
+    """Test that include cycles are reported."""
+    tmp_dir, write = graph_dir
+    write("a.yaml", {"include": "b.yaml"})
+    write("b.yaml", {"include": "a.yaml"})
+    with pytest.raises(IncludeCycleError, match="Include cycle"):
+        YAML2Cypher().yaml_file_to_cypher(os.path.join(tmp_dir, "a.yaml"))
+
+
+def test_missing_include(graph_dir):
+    """Test that a missing non-glob include is an error."""
+    _, write = graph_dir
+    path = write("broken.yaml", {"include": "missing.yaml"})
+    with pytest.raises(FileNotFoundError):
+        YAML2Cypher().yaml_file_to_cypher(path)
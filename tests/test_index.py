@@ -0,0 +1,83 @@
+import pytest
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.index import DanglingReferenceError, NodeIndex
+
+
+@pytest.fixture
+def graph_data():
+    """Graph data with one relationship to an undefined node."""
+    return {
+        "nodes": {
+            "p1": {"labels": "Person"},
+            "p2": {"labels": "Person"},
+        },
+        "relationships": [
+            {"from": "p1", "to": "p2", "type": "KNOWS"},
+            {"from": "p2", "to": "p1", "type": "KNOWS"},
+            {"from": "p1", "to": "c1", "type": "WORKS_FOR"},
+        ],
+    }
+
+
+def test_degrees():
+    """Test per-node degree counting."""
+    index = NodeIndex()
+    index.add_node("a")
+    index.add_node("b")
+    index.add_relationship("a", "b")
+    index.add_relationship("a", "a")
+
+    assert len(index) == 2
+    assert "a" in index
+    assert index.degree("a") == (2, 1)
+    assert index.degree("b") == (0, 1)
+    assert list(index.degrees()) == [("a", 2, 1), ("b", 0, 1)]
+    assert index.dangling() == {}
+
+
+def test_relationships_before_nodes():
+    """Test that references resolve when nodes arrive later."""
+    index = NodeIndex()
+    index.add_relationship("a", "b")
+    index.add_relationship("c", "b")
+    assert index.dangling() == {"a": [0], "b": [0, 1], "c": [1]}
+
+    index.add_node("a")
+    index.add_node("b")
+    assert index.dangling() == {"c": [1]}
+    assert index.degree("a") == (1, 0)
+    assert index.degree("b") == (0, 2)
+
+
+def test_dangling_reference_warning(graph_data):
+    """Test that dangling references are reported but still converted."""
+    converter = YAML2Cypher()
+    statements = converter.convert_yaml_to_cypher(graph_data)
+
+    assert len(statements) == 5
+    assert converter.node_index.dangling() == {"c1": [2]}
+    assert converter.node_index.degree("p1") == (2, 1)
+
+
+def test_dangling_reference_strict(graph_data):
+    """Test that strict mode rejects dangling references."""
+    converter = YAML2Cypher({"strict_references": True})
+    with pytest.raises(DanglingReferenceError, match="c1"):
+        converter.convert_yaml_to_cypher(graph_data)
+
+
+def test_streamed_records_strict():
+    """Test strict validation of streamed records in any order."""
+    records = [
+        {"from": "p1", "to": "p2", "type": "KNOWS"},
+        {"id": "p1", "labels": "Person"},
+        {"id": "p2", "labels": "Person"},
+    ]
+    converter = YAML2Cypher({"strict_references": True})
+    statements = list(converter.convert_records(records))
+    assert len(statements) == 3
+    assert converter.node_index.degree("p2") == (0, 1)
+
+    with pytest.raises(DanglingReferenceError):
+        list(converter.convert_records(records[:2]))
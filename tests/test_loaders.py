@@ -0,0 +1,228 @@
+import json
+import os
+import tempfile
+
+import pytest
+import yaml
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher import loaders
+
+
+@pytest.fixture
+def graph_data():
+    """Graph data shared by the format tests."""
+    return {
+        "nodes": {
+            "person1": {"labels": "Person", "name": "John Doe", "age": 30},
+            "company1": {
+                "labels": ["Company", "Organization"],
+                "name": "ACME Inc.",
+            },
+        },
+        "relationships": [
+            {
+                "from": "person1",
+                "to": "company1",
+                "type": "WORKS_FOR",
+                "since": 2015,
+            }
+        ],
+    }
+
+
+def _write_temp(suffix, content):
+    with tempfile.NamedTemporaryFile(
+        suffix=suffix, delete=False, mode="w"
+    ) as f:
+        f.write(content)
+        return f.name
+
+
+@pytest.fixture
+def graph_files(graph_data):
+    """Write the graph data as YAML, JSON and NDJSON files."""
+    lines = [
+        json.dumps({"id": node_id, **node_data})
+        for node_id, node_data in graph_data["nodes"].items()
+    ]
+    lines += [json.dumps(rel) for rel in graph_data["relationships"]]
+    paths = {
+        "yaml": _write_temp(
+            ".yaml", yaml.dump(graph_data, sort_keys=False)
+        ),
+        "json": _write_temp(".json", json.dumps(graph_data)),
+        "ndjson": _write_temp(".ndjson", "\n".join(lines) + "\n\n"),
+    }
+
+    yield paths
+
+    for path in paths.values():
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def test_detect_format():
+    """Test format detection from file extensions."""
+    assert loaders.detect_format("graph.yaml") == "yaml"
+    assert loaders.detect_format("graph.yml") == "yaml"
+    assert loaders.detect_format("graph.JSON") == "json"
+    assert loaders.detect_format("graph.ndjson") == "ndjson"
+    assert loaders.detect_format("graph.jsonl") == "ndjson"
+    assert loaders.detect_format("graph") == "yaml"
+
+
+def test_load_file_formats(graph_files, graph_data):
+    """Test that every format loads to the same graph data."""
+    for path in graph_files.values():
+        assert loaders.load_file(path) == graph_data
+
+
+def test_formats_produce_same_cypher(graph_files):
+    """Test that every format converts to the same Cypher."""
+    converter = YAML2Cypher()
+    expected = converter.yaml_file_to_cypher(graph_files["yaml"])
+    assert converter.yaml_file_to_cypher(graph_files["json"]) == expected
+    assert converter.yaml_file_to_cypher(graph_files["ndjson"]) == expected
+
+
+def test_ndjson_node_without_id():
+    """Test that NDJSON node records must carry an id."""
+    path = _write_temp(".ndjson", '{"labels": "Person"}\n')
+    try:
+        with pytest.raises(ValueError):
+            YAML2Cypher().yaml_file_to_cypher(path)
+    finally:
+        os.unlink(path)
+
+
+def test_ndjson_non_object_line():
+    """Test that NDJSON lines must be JSON objects."""
+    path = _write_temp(".ndjson", "[1, 2, 3]\n")
+    try:
+        with pytest.raises(ValueError):
+            list(loaders.iter_ndjson(path))
+    finally:
+        os.unlink(path)
+
+
+@pytest.fixture
+def yaml_stream(graph_data):
+    """Write the graph data as a two-document YAML stream."""
+    people = {"nodes": {"person1": graph_data["nodes"]["person1"]}}
+    rest = {
+        "nodes": {"company1": graph_data["nodes"]["company1"]},
+        "relationships": graph_data["relationships"],
+    }
+    path = _write_temp(
+        ".yaml",
+        "# exported fragments\n"
+        + yaml.dump_all([people, None, rest], sort_keys=False),
+    )
+    yield path
+    os.unlink(path)
+
+
+def test_yaml_stream_detection(yaml_stream, graph_files):
+    """Test that document markers are only treated as a stream when
+    they separate documents."""
+    assert loaders.is_yaml_stream(yaml_stream)
+    assert not loaders.is_yaml_stream(graph_files["yaml"])
+
+    path = _write_temp(".yaml", "%YAML 1.1\n---\nnodes: {}\n")
+    try:
+        assert not loaders.is_yaml_stream(path)
+    finally:
+        os.unlink(path)
+
+
+def test_yaml_stream_loads_merged(yaml_stream, graph_data):
+    """Test that loading a whole stream merges its documents."""
+    assert loaders.load_file(yaml_stream) == graph_data
+    assert loaders.load_file(yaml_stream, fast_yaml=True) == graph_data
+
+
+def test_yaml_stream_converted_per_document(yaml_stream, graph_files):
+    """Test that streams are converted lazily, one document at a time,
+    with references resolved across documents."""
+    converter = YAML2Cypher({"strict_references": True})
+    expected = converter.yaml_file_to_cypher(graph_files["yaml"])
+
+    parsed = []
+
+    def documents():
+        for document in loaders.iter_yaml_documents(yaml_stream):
+            parsed.append(document)
+            yield document
+
+    statements = converter.convert_documents(documents())
+    assert next(statements) == expected[0]
+    assert len(parsed) == 1
+    assert [expected[0]] + list(statements) == expected
+    assert len(parsed) == 2
+
+    assert converter.yaml_file_to_cypher(yaml_stream) == expected
+
+
+def test_ndjson_ids_kept_as_is():
+    """Test that numeric ids match numeric endpoints and that node
+    records with from/to properties stay nodes."""
+    lines = [
+        {"id": 1, "labels": "Airport"},
+        {"id": 2, "labels": "Airport"},
+        {"id": "f1", "labels": "Flight", "from": "JFK", "to": "LAX"},
+        {"from": 1, "to": 2, "type": "ROUTE"},
+    ]
+    path = _write_temp(
+        ".ndjson", "\n".join(json.dumps(line) for line in lines) + "\n"
+    )
+    try:
+        data = loaders.load_file(path)
+        assert list(data["nodes"]) == [1, 2, "f1"]
+        assert data["nodes"]["f1"]["from"] == "JFK"
+        assert len(data["relationships"]) == 1
+
+        converter = YAML2Cypher({"mode": "merge", "strict_references": True})
+        statements = converter.yaml_file_to_cypher(path)
+        assert any("{key: 1, props: {}}" in s for s in statements)
+        assert any("{from: 1, to: 2," in s for s in statements)
+
+        # Ids that are not identifiers are quoted as variable names
+        assert YAML2Cypher().yaml_file_to_cypher(path) == [
+            "CREATE (`1`:Airport )",
+            "CREATE (`2`:Airport )",
+            "CREATE (f1:Flight {from: 'JFK', to: 'LAX'})",
+            "CREATE (`1`)-[:ROUTE ]->(`2`)",
+        ]
+    finally:
+        os.unlink(path)
+
+
+def test_ndjson_relationship_with_id():
+    """Test that relationship records may carry their own id."""
+    assert loaders.is_relationship_record(
+        {"id": "r1", "from": "a", "to": "b", "type": "KNOWS"}
+    )
+    assert not loaders.is_relationship_record(
+        {"id": "f1", "from": "a", "to": "b"}
+    )
+    assert not loaders.is_relationship_record({"id": "a", "type": "T"})
+    assert loaders.is_relationship_record({"from": "a", "to": "b"})
+    with pytest.raises(ValueError, match="node or a relationship"):
+        loaders.is_relationship_record(
+            {"id": "x", "labels": "L", "from": "a", "to": "b", "type": "T"}
+        )
+
+    path = _write_temp(
+        ".ndjson",
+        '{"id": "a"}\n{"id": "b"}\n'
+        '{"id": "r1", "from": "a", "to": "b", "type": "KNOWS"}\n',
+    )
+    try:
+        assert YAML2Cypher().yaml_file_to_cypher(path) == [
+            "CREATE (a )",
+            "CREATE (b )",
+            "CREATE (a)-[:KNOWS {id: 'r1'}]->(b)",
+        ]
+    finally:
+        os.unlink(path)
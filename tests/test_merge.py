@@ -0,0 +1,130 @@
+import pytest
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.merge import Deduplicator, MergeConflictError
+
+
+@pytest.fixture
+def records():
+    """Overlapping node and relationship records."""
+    return [
+        {"id": "p1", "labels": "Person", "name": "John", "age": 30},
+        {"id": "c1", "labels": "Company", "name": "ACME"},
+        {"from": "p1", "to": "c1", "type": "WORKS_FOR", "since": 2015},
+        {"id": "p1", "labels": ["Person", "Employee"], "age": 31},
+        {"from": "p1", "to": "c1", "type": "WORKS_FOR", "since": 2015},
+        {"from": "p1", "to": "c1", "type": "WORKS_FOR", "since": 2020},
+    ]
+
+
+def test_deduplicate_nodes():
+    """Test label union and conflict policies for nodes."""
+    for policy, age in (("last", 31), ("first", 30)):
+        dedup = Deduplicator(policy)
+        dedup.add_node("p1", {"labels": "Person", "name": "John", "age": 30})
+        dedup.add_node("p1", {"labels": ["Employee"], "age": 31})
+        labels, properties = dedup.nodes["p1"]
+        assert labels == ["Person", "Employee"]
+        assert properties == {"name": "John", "age": age}
+        assert dedup.duplicate_nodes == 1
+
+    dedup = Deduplicator("error")
+    dedup.add_node("p1", {"age": 30})
+    dedup.add_node("p1", {"age": 30, "name": "John"})
+    with pytest.raises(MergeConflictError):
+        dedup.add_node("p1", {"age": 31})
+
+
+def test_deduplicate_relationships_with_keys():
+    """Test that key properties are part of a relationship's identity."""
+    rel = {"from": "p1", "to": "c1", "type": "WORKS_FOR"}
+    dedup = Deduplicator(relationship_keys=["since"])
+    dedup.add_relationship({**rel, "since": 2015, "role": "Dev"})
+    dedup.add_relationship({**rel, "since": 2015, "role": "Lead"})
+    dedup.add_relationship({**rel, "since": 2020})
+
+    assert len(dedup.relationships) == 2
+    assert dedup.duplicate_relationships == 1
+
+    dedup = Deduplicator()
+    dedup.add_relationship({**rel, "since": 2015})
+    dedup.add_relationship({**rel, "since": 2020})
+    assert len(dedup.relationships) == 1
+
+
+def test_unknown_policy():
+    """Test that unknown conflict policies are rejected."""
+    with pytest.raises(ValueError):
+        Deduplicator("newest")
+
+
+def test_merge_statements(records):
+    """Test batched MERGE output for duplicated records."""
+    converter = YAML2Cypher(
+        {"mode": "merge", "merge_relationship_keys": ["since"]}
+    )
+    statements = list(converter.convert_records(records))
+
+    assert statements == [
+        "CREATE INDEX IF NOT EXISTS FOR (n:Person) ON (n._id)",
+        "CREATE INDEX IF NOT EXISTS FOR (n:Company) ON (n._id)",
+        "UNWIND [{key: 'p1', props: {name: 'John', age: 31}}] AS row "
+        "MERGE (n:Person {_id: row.key}) SET n:Employee, n += row.props",
+        "UNWIND [{key: 'c1', props: {name: 'ACME'}}] AS row "
+        "MERGE (n:Company {_id: row.key}) SET n += row.props",
+        "UNWIND [{from: 'p1', to: 'c1', key: {since: 2015}, props: {}}, "
+        "{from: 'p1', to: 'c1', key: {since: 2020}, props: {}}] AS row "
+        "MATCH (a:Person {_id: row.from}) "
+        "MATCH (b:Company {_id: row.to}) "
+        "MERGE (a)-[r:WORKS_FOR {since: row.key.since}]->(b) "
+        "SET r += row.props",
+    ]
+    assert converter.deduplicator.duplicate_nodes == 1
+    assert converter.deduplicator.duplicate_relationships == 1
+
+
+def test_merge_label(records):
+    """Test that a shared merge label survives label order changes."""
+    first = YAML2Cypher({"mode": "merge"}).convert_yaml_to_cypher(
+        {"nodes": {"p1": {"labels": ["Person"]}}}
+    )
+    second = YAML2Cypher({"mode": "merge"}).convert_yaml_to_cypher(
+        {"nodes": {"p1": {"labels": ["Employee", "Person"]}}}
+    )
+    # Without a merge label, the second load merges on another label and
+    # would create the node again
+    assert "MERGE (n:Person {_id: row.key})" in first[1]
+    assert "MERGE (n:Employee {_id: row.key})" in second[1]
+
+    converter = YAML2Cypher({"mode": "merge", "merge_label": "Entity"})
+    statements = list(converter.convert_records(records))
+    assert statements[0] == (
+        "CREATE INDEX IF NOT EXISTS FOR (n:Entity) ON (n._id)"
+    )
+    assert len([s for s in statements if "CREATE INDEX" in s]) == 1
+    assert statements[1].endswith(
+        "MERGE (n:Entity {_id: row.key}) "
+        "SET n:Person, n:Employee, n += row.props"
+    )
+    assert "MATCH (a:Entity {_id: row.from}) " in statements[-1]
+    assert "MATCH (b:Entity {_id: row.to}) " in statements[-1]
+
+
+def test_merge_batches():
+    """Test that UNWIND lists respect the batch size."""
+    data = {
+        "nodes": {f"n{i}": {"labels": "N", "i": i} for i in range(5)},
+    }
+    converter = YAML2Cypher(
+        {"mode": "merge", "batch_size": 2, "merge_indexes": False}
+    )
+    statements = converter.convert_yaml_to_cypher(data)
+    assert len(statements) == 3
+    assert all(s.startswith("UNWIND [") for s in statements)
+    assert statements[2].count("key:") == 1
+
+
+def test_unknown_mode():
+    """Test that unknown output modes are rejected."""
+    with pytest.raises(ValueError):
+        YAML2Cypher({"mode": "upsert"})
@@ -0,0 +1,134 @@
+import glob
+import os
+import tempfile
+
+import pytest
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.index import DanglingReferenceError
+from yaml2cypher.ordering import ExternalSorter
+
+
+@pytest.fixture
+def graph_data():
+    """Graph data with relationships in no particular order."""
+    return {
+        "nodes": {
+            "a": {"labels": "N"},
+            "b": {"labels": "N"},
+            "c": {"labels": "N"},
+        },
+        "relationships": [
+            {"from": "c", "to": "a", "type": "X"},
+            {"from": "a", "to": "c", "type": "Y"},
+            {"from": "b", "to": "a", "type": "X"},
+            {"from": "a", "to": "b", "type": "X"},
+        ],
+    }
+
+
+def test_external_sorter_spills_and_merges():
+    """Test that spilled runs merge back in key order."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sorter = ExternalSorter(memory_budget=300, tmp_dir=tmp_dir)
+        for i in reversed(range(20)):
+            sorter.add((i % 5, f"n{i}"), f"stmt{i}")
+        assert sorter.spill_count > 0
+
+        result = list(sorter)
+        expected = [
+            f"stmt{i}"
+            for i in sorted(range(20), key=lambda i: (i % 5, f"n{i}"))
+        ]
+        assert result == expected
+        assert glob.glob(os.path.join(tmp_dir, "*")) == []
+
+
+def test_external_sorter_is_stable():
+    """Test that equal keys keep insertion order."""
+    sorter = ExternalSorter(memory_budget=1)
+    for i in range(5):
+        sorter.add((0,), f"stmt{i}")
+    assert list(sorter) == [f"stmt{i}" for i in range(5)]
+
+
+def test_external_sorter_close():
+    """Test that closing an unread sorter deletes its spill files."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ExternalSorter(memory_budget=1, tmp_dir=tmp_dir) as sorter:
+            sorter.add((0,), "stmt")
+            assert glob.glob(os.path.join(tmp_dir, "*")) != []
+        assert glob.glob(os.path.join(tmp_dir, "*")) == []
+
+
+def test_strict_failure_removes_spill_files(graph_data):
+    """Test that spill files are deleted when a reference check fails."""
+    graph_data["relationships"].append({"from": "a", "to": "x", "type": "X"})
+    records = [
+        {"id": node_id, **node_data}
+        for node_id, node_data in graph_data["nodes"].items()
+    ] + graph_data["relationships"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = {
+            "relationship_order": "source",
+            "sort_memory_budget": 1,
+            "sort_tmp_dir": tmp_dir,
+            "strict_references": True,
+        }
+        converter = YAML2Cypher(config)
+        with pytest.raises(DanglingReferenceError):
+            converter.convert_yaml_to_cypher(graph_data)
+        with pytest.raises(DanglingReferenceError):
+            list(converter.convert_documents([graph_data]))
+        with pytest.raises(DanglingReferenceError):
+            list(converter.convert_records(records))
+        assert glob.glob(os.path.join(tmp_dir, "*")) == []
+
+
+def test_order_by_source(graph_data):
+    """Test relationship output ordered by source node."""
+    converter = YAML2Cypher({"relationship_order": "source"})
+    statements = converter.convert_yaml_to_cypher(graph_data)
+    assert statements[3:] == [
+        "CREATE (a)-[:X ]->(b)",
+        "CREATE (a)-[:Y ]->(c)",
+        "CREATE (b)-[:X ]->(a)",
+        "CREATE (c)-[:X ]->(a)",
+    ]
+
+
+def test_order_by_type_and_source(graph_data):
+    """Test relationship output ordered by type, then source node."""
+    converter = YAML2Cypher(
+        {"relationship_order": "type_source", "sort_memory_budget": 1}
+    )
+    statements = converter.convert_yaml_to_cypher(graph_data)
+    assert statements[3:] == [
+        "CREATE (a)-[:X ]->(b)",
+        "CREATE (b)-[:X ]->(a)",
+        "CREATE (c)-[:X ]->(a)",
+        "CREATE (a)-[:Y ]->(c)",
+    ]
+
+
+def test_ordered_records_after_nodes():
+    """Test that streamed relationships are emitted after all nodes."""
+    records = [
+        {"from": "b", "to": "a", "type": "X"},
+        {"id": "a"},
+        {"from": "a", "to": "b", "type": "X"},
+        {"id": "b"},
+    ]
+    converter = YAML2Cypher({"relationship_order": "source"})
+    assert list(converter.convert_records(records)) == [
+        "CREATE (a )",
+        "CREATE (b )",
+        "CREATE (a)-[:X ]->(b)",
+        "CREATE (b)-[:X ]->(a)",
+    ]
+
+
+def test_unknown_order():
+    """Test that unknown orders are rejected."""
+    with pytest.raises(ValueError):
+        YAML2Cypher({"relationship_order": "target"})
@@ -0,0 +1,83 @@
+import pytest
+
+from yaml2cypher import YAML2Cypher
+from yaml2cypher.schema import ColumnTable, ElementSchema, infer_schema
+
+
+@pytest.fixture
+def graph_data():
+    """Graph data with a property whose type drifts."""
+    return {
+        "nodes": {
+            "p1": {"labels": "Person", "name": "John", "age": 30},
+            "p2": {"labels": "Person", "name": "Jane", "age": "unknown"},
+            "p3": {"labels": "Person", "name": "Bob", "tags": ["a", "b"]},
+            "c1": {"labels": ["Company"], "name": "ACME", "public": True},
+        },
+        "relationships": [
+            {"from": "p1", "to": "c1", "type": "WORKS_FOR", "since": 2015},
+            {"from": "p2", "to": "c1", "type": "WORKS_FOR", "since": None},
+        ],
+    }
+
+
+def test_infer_schema(graph_data):
+    """Test per-label and per-type property schemas."""
+    schema = infer_schema(graph_data)
+
+    person = schema.nodes[("Person",)]
+    assert person.count == 3
+    assert person.properties["name"].column_kind == "string"
+    assert person.properties["age"].value_types == ["integer", "string"]
+    assert person.properties["age"].column_kind == "object"
+    assert person.properties["tags"].element_types == {"string": 2}
+    assert not person.nullable("name")
+    assert person.nullable("age")
+
+    works_for = schema.relationships["WORKS_FOR"]
+    assert works_for.properties["since"].column_kind == "integer"
+    assert works_for.nullable("since")
+
+    assert schema.drift() == ["(:Person).age: integer, string"]
+    report = schema.report()
+    assert "(:Person) 3 element(s), 3 sampled" in report
+    assert "  tags: list<string> (nullable)" in report
+    assert "Type drift:" in report
+
+
+def test_sampling(graph_data):
+    """Test that only the sample is inspected, but all are counted."""
+    schema = infer_schema(graph_data, sample_size=1)
+    person = schema.nodes[("Person",)]
+    assert person.count == 3
+    assert person.sampled == 1
+    assert person.properties["age"].column_kind == "integer"
+
+
+def test_column_table_formats_like_converter():
+    """Test that columnar formatting matches per-value formatting."""
+    rows = [
+        {"name": "O'Reilly", "age": 30, "score": 0.5, "ok": True},
+        {"name": "Jane", "age": None, "ok": False, "extra": [1, 2]},
+        {"age": 2**70, "score": 1.25, "ok": "yes"},
+    ]
+    element_schema = ElementSchema()
+    element_schema.observe(rows[0], True)
+    table = ColumnTable(element_schema)
+    for row in rows:
+        table.append(row)
+
+    converter = YAML2Cypher()
+    formatted = table.format_rows(converter._format_property_value, {})
+    assert formatted == [
+        converter._generate_node_properties(row) for row in rows
+    ]
+
+
+def test_merge_records_schema():
+    """Test that MERGE mode records the schema it formatted with."""
+    converter = YAML2Cypher({"mode": "merge", "merge_indexes": False})
+    converter.convert_yaml_to_cypher(
+        {"nodes": {"n1": {"labels": "N", "x": 1}, "n2": {"labels": "N"}}}
+    )
+    assert converter.schema.nodes[("N",)].nullable("x")
@@ -0,0 +1,116 @@
+import os
+import tempfile
+
+import pytest
+
+from yaml2cypher import YAML2Cypher, main
+from yaml2cypher.sharding import UnionFind, hash_shard, plan_shards
+
+
+@pytest.fixture
+def graph_data():
+    """Graph with three connected components."""
+    return {
+        "nodes": {
+            "a": {"labels": "N"},
+            "b": {"labels": "N"},
+            "c": {"labels": "N"},
+            "d": {"labels": "N"},
+            "e": {"labels": "N"},
+            "f": {"labels": "N"},
+        },
+        "relationships": [
+            {"from": "a", "to": "b", "type": "R"},
+            {"from": "b", "to": "c", "type": "R"},
+            {"from": "d", "to": "e", "type": "R"},
+        ],
+    }
+
+
+def test_union_find():
+    """Test merging and finding sets."""
+    sets = UnionFind()
+    items = [sets.add() for _ in range(5)]
+    sets.union(items[0], items[1])
+    sets.union(items[3], items[1])
+    assert sets.find(items[0]) == sets.find(items[3])
+    assert sets.find(items[2]) != sets.find(items[0])
+    assert sets.find(items[4]) == items[4]
+
+
+def test_component_sharding(graph_data):
+    """Test that components stay whole and shards are balanced."""
+    plan = plan_shards(graph_data, 2, "component")
+
+    assert plan.cut_edges == []
+    assert plan.node_shard["a"] == plan.node_shard["b"] == plan.node_shard["c"]
+    assert plan.node_shard["d"] == plan.node_shard["e"]
+    assert plan.node_shard["a"] != plan.node_shard["d"]
+    assert sorted(plan.sizes()) == [(3, 1), (3, 2)]
+
+
+def test_hash_sharding(graph_data):
+    """Test that hash sharding reports relationships crossing shards."""
+    plan = plan_shards(graph_data, 3, "hash")
+
+    for node_id in graph_data["nodes"]:
+        assert plan.node_shard[node_id] == hash_shard(node_id, 3)
+    emitted = sum(rels for _, rels in plan.sizes())
+    assert emitted + len(plan.cut_edges) == 3
+    for rel in plan.cut_edges:
+        assert plan.node_shard[rel["from"]] != plan.node_shard[rel["to"]]
+
+
+def test_invalid_sharding(graph_data):
+    """Test that invalid arguments are rejected."""
+    with pytest.raises(ValueError):
+        plan_shards(graph_data, 0)
+    with pytest.raises(ValueError):
+        plan_shards(graph_data, 2, "random")
+
+
+def test_convert_yaml_to_shards(graph_data):
+    """Test that each shard converts to self-contained statements."""
+    converter = YAML2Cypher({"strict_references": True})
+    shards = converter.convert_yaml_to_shards(graph_data, 2)
+
+    assert len(shards) == 2
+    assert sum(len(statements) for statements in shards) == 9
+    assert converter.shard_output_path("out/graph.cypher", 1) == (
+        "out/graph.shard1.cypher"
+    )
+
+
+def test_cli_shards():
+    """Test writing one output file per shard from the CLI."""
+    example = os.path.join(
+        os.path.dirname(__file__), "..", "examples", "example.yaml"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "graph.cypher")
+        assert main([example, "-o", output, "--shards", "2"]) == 0
+        assert sorted(os.listdir(tmp_dir)) == [
+            "graph.shard0.cypher",
+            "graph.shard1.cypher",
+        ]
+
+
+def test_hash_shards_cut_edges_linked(graph_data):
+    """Test that relationships crossing hash shards are linked by id."""
+    converter = YAML2Cypher()
+    shards = converter.convert_yaml_to_shards(graph_data, 3, "hash")
+    cut = converter.shard_plan.cut_edges
+    assert cut
+    endpoints = {rel[field] for rel in cut for field in ("from", "to")}
+    created = [s for statements in shards for s in statements]
+    for node_id in endpoints:
+        assert f"CREATE ({node_id}:N {{_id: '{node_id}'}})" in created
+
+    links = converter.cut_edges_to_cypher()
+    assert links[0] == "CREATE INDEX IF NOT EXISTS FOR (n:N) ON (n._id)"
+    rows = " ".join(links[1:])
+    for rel in cut:
+        assert f"{{from: '{rel['from']}', to: '{rel['to']}'" in rows
+    assert converter.cut_output_path("out/graph.cypher") == (
+        "out/graph.cut.cypher"
+    )
@@ -0,0 +1,129 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from yaml2cypher import main
+from yaml2cypher.server import (
+    ConversionServer,
+    request_conversion,
+    request_shutdown,
+)
+
+ROOT_DIR = Path(__file__).parent / ".."
+EXAMPLE_YAML = str(ROOT_DIR / "examples" / "example.yaml")
+
+# Upper bound on the cumulative import time of the CLI and converter
+# modules, well below the time of a whole conversion.
+IMPORT_BUDGET_US = 60_000
+
+# Modules of optional features, imported only when they are used
+OPTIONAL_BACKENDS = (
+    "yaml2cypher.compact",
+    "yaml2cypher.csv_export",
+    "yaml2cypher.fastyaml",
+    "yaml2cypher.includes",
+    "yaml2cypher.merge",
+    "yaml2cypher.ordering",
+    "yaml2cypher.schema",
+    "yaml2cypher.sharding",
+)
+
+
+def _import_times(module):
+    """Return {module: cumulative microseconds} from ``-X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_is_lazy():
+    """Test that importing the CLI does not load the converter or PyYAML."""
+    times = _import_times("yaml2cypher.cli")
+    assert "yaml" not in times
+    assert "yaml2cypher.converter" not in times
+    assert times["yaml2cypher.cli"] < IMPORT_BUDGET_US
+
+
+def test_converter_import_is_lazy():
+    """Test that the converter loads neither PyYAML nor optional backends."""
+    times = _import_times("yaml2cypher.converter")
+    assert "yaml" not in times
+    assert not [name for name in OPTIONAL_BACKENDS if name in times]
+    assert times["yaml2cypher.converter"] < IMPORT_BUDGET_US
+
+
+@pytest.fixture
+def server():
+    """Run a conversion server on a temporary Unix socket."""
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix sockets are not available")
+    tmp_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(tmp_dir, "yaml2cypher.sock")
+    conversion_server = ConversionServer(socket_path)
+    thread = threading.Thread(target=conversion_server.serve_forever)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.01)
+
+    yield conversion_server
+
+    request_shutdown(socket_path)
+    thread.join(timeout=5)
+    os.rmdir(tmp_dir)
+
+
+def test_server_conversion(server):
+    """Test that the server produces the same output as a local run."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_output = os.path.join(tmp_dir, "local.cypher")
+        remote_output = os.path.join(tmp_dir, "remote.cypher")
+        assert main([EXAMPLE_YAML, "-o", local_output]) == 0
+
+        for _ in range(2):
+            exit_code = main(
+                [
+                    EXAMPLE_YAML,
+                    "-o",
+                    remote_output,
+                    "--server",
+                    server.socket_path,
+                ]
+            )
+            assert exit_code == 0
+
+        with open(local_output) as f1, open(remote_output) as f2:
+            assert f1.read() == f2.read()
+
+    # The second request was served from the parsed-file cache
+    assert server.file_cache.hits == 1
+    assert server.file_cache.misses == 1
+
+
+def test_server_reports_errors(server):
+    """Test that conversion errors are returned to the client."""
+    response = request_conversion(
+        server.socket_path, "/nonexistent/file.yaml", "/tmp/out.cypher"
+    )
+    assert response["ok"] is False
+    assert "No such file" in response["error"]
@@ -0,0 +1,117 @@
+import os
+import tempfile
+
+import pytest
+import yaml
+
+from yaml2cypher.cli import parse_args
+from yaml2cypher.watch import Watcher
+
+
+def _write_yaml(path, data):
+    with open(path, "w") as f:
+        yaml.dump(data, f, sort_keys=False)
+    # Make sure the change is visible even on coarse mtime clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def graph_data():
+    """Graph data for the watched files."""
+    return {
+        "nodes": {
+            "p1": {"labels": "Person", "name": "John"},
+            "p2": {"labels": "Person", "name": "Jane"},
+        },
+        "relationships": [{"from": "p1", "to": "p2", "type": "KNOWS"}],
+    }
+
+
+@pytest.fixture
+def watch_dir(graph_data):
+    """Directory with two graph files and one unrelated file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write_yaml(os.path.join(tmp_dir, "a.yaml"), graph_data)
+        _write_yaml(os.path.join(tmp_dir, "b.yaml"), graph_data)
+        with open(os.path.join(tmp_dir, "notes.txt"), "w") as f:
+            f.write("not a graph")
+        yield tmp_dir
+
+
+def test_initial_poll_converts_all(watch_dir):
+    """Test that the first poll converts every graph file."""
+    watcher = Watcher(watch_dir)
+    written = watcher.poll_once()
+
+    assert [os.path.basename(p) for p in written] == ["a.yaml", "b.yaml"]
+    with open(os.path.join(watch_dir, "a.cypher")) as f:
+        assert "CREATE (p1:Person {name: 'John'});" in f.read()
+
+    # Nothing changed, nothing is reconverted
+    assert watcher.scan() == []
+    assert watcher.poll_once() == []
+
+
+def test_only_changed_file_and_elements(watch_dir, graph_data):
+    """Test that only the changed file and element are reconverted."""
+    watcher = Watcher(watch_dir)
+    watcher.poll_once()
+
+    graph_data["nodes"]["p2"]["name"] = "Janet"
+    path = os.path.join(watch_dir, "a.yaml")
+    _write_yaml(path, graph_data)
+
+    assert watcher.poll_once() == [path]
+    assert watcher.converter.converted == 1
+    assert watcher.converter.reused == 2
+    with open(os.path.join(watch_dir, "a.cypher")) as f:
+        assert "{name: 'Janet'}" in f.read()
+
+
+def test_unchanged_output_not_rewritten(watch_dir, graph_data):
+    """Test that touching a file without changes keeps its output."""
+    watcher = Watcher(watch_dir)
+    watcher.poll_once()
+
+    _write_yaml(os.path.join(watch_dir, "b.yaml"), graph_data)
+    assert watcher.scan() != []
+    assert watcher.poll_once() == []
+
+
+def test_file_cache_is_bounded(watch_dir):
+    """Test that the parsed-file cache respects its bound."""
+    watcher = Watcher(watch_dir, cache_size=1)
+    watcher.poll_once()
+    assert len(watcher.file_cache) == 1
+    assert watcher.converter.document_cache.max_entries == 1
+
+    args = parse_args(["--watch", watch_dir, "--cache-size", "1"])
+    assert args.cache_size == 1
+
+
+def test_deleted_file_forgotten(watch_dir):
+    """Test that deleted files are dropped from the watcher state."""
+    watcher = Watcher(watch_dir)
+    watcher.poll_once()
+    os.unlink(os.path.join(watch_dir, "b.yaml"))
+    assert watcher.scan() == []
+    assert len(watcher.file_cache) == 1
+
+
+def test_included_file_change_reconverts_root(watch_dir):
+    """Test that editing an included file reconverts its includers."""
+    with tempfile.TemporaryDirectory() as shared_dir:
+        shared = os.path.join(shared_dir, "people.yaml")
+        _write_yaml(shared, {"nodes": {"p3": {"name": "Joe"}}})
+        root = os.path.join(watch_dir, "a.yaml")
+        _write_yaml(root, {"include": shared})
+
+        watcher = Watcher(watch_dir)
+        watcher.poll_once()
+        assert watcher.scan() == []
+
+        _write_yaml(shared, {"nodes": {"p3": {"name": "Joseph"}}})
+        assert watcher.poll_once() == [root]
+        with open(os.path.join(watch_dir, "a.cypher")) as f:
+            assert "{name: 'Joseph'}" in f.read()
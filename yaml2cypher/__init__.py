@@ -1,6 +1,23 @@
 # yaml2cypher/__init__.py
-from yaml2cypher.converter import YAML2Cypher
-from yaml2cypher.cli import main
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from yaml2cypher.cli import main
+    from yaml2cypher.converter import YAML2Cypher
 
 __version__ = "0.1.0"
 __all__ = ["YAML2Cypher", "main"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the public API on first use so that ``import yaml2cypher`` and
+    # the CLI entry point do not pay for PyYAML until a file is converted.
+    if name == "YAML2Cypher":
+        from yaml2cypher.converter import YAML2Cypher
+
+        return YAML2Cypher
+    if name == "main":
+        from yaml2cypher.cli import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,9 +2,10 @@ import argparse
 import os
 import sys
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from yaml2cypher.converter import YAML2Cypher
+# Number of cut edges listed in the sharding report
+_MAX_CUT_EDGES_SHOWN = 20
 
 
 def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
@@ -19,14 +20,229 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Convert YAML files to Cypher queries"
     )
-    parser.add_argument("yaml_file", help="Path to YAML file")
+    parser.add_argument(
+        "yaml_file", nargs="?", help="Path to YAML, JSON or NDJSON file"
+    )
     parser.add_argument(
         "-o", "--output", help="Output Cypher file (default: <input>.cypher)"
     )
+    parser.add_argument(
+        "--fast-yaml",
+        action="store_true",
+        help="Parse simple YAML with the fast scanner (falls back to PyYAML)",
+    )
+    parser.add_argument(
+        "--vector-property",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Emit this list property as a vecf32 vector (repeatable)",
+    )
+    parser.add_argument(
+        "--vector-precision",
+        type=int,
+        metavar="DIGITS",
+        help="Significant digits for vector elements (default: exact)",
+    )
+    parser.add_argument(
+        "--strict-references",
+        action="store_true",
+        help="Fail if relationships reference undefined nodes",
+    )
+    parser.add_argument(
+        "--order-relationships",
+        choices=["source", "type-source"],
+        help="Sort relationship output by source node or by (type, source)",
+    )
+    parser.add_argument(
+        "--sort-memory",
+        type=int,
+        default=64,
+        metavar="MB",
+        help="Memory budget for sorting relationships before spilling "
+        "to disk (default: 64)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--merge",
+        action="store_true",
+        help="Deduplicate elements and emit idempotent MERGE statements",
+    )
+    mode.add_argument(
+        "--compact",
+        action="store_true",
+        help="Coalesce nodes and relationships into self-contained CREATE "
+        "statements of at most --batch-size patterns",
+    )
+    parser.add_argument(
+        "--merge-key",
+        default="_id",
+        metavar="PROPERTY",
+        help="Indexed property that stores node ids in MERGE and compact "
+        "mode (default: _id)",
+    )
+    parser.add_argument(
+        "--merge-label",
+        metavar="LABEL",
+        help="Label shared by every node to MERGE and index on, instead of "
+        "each node's first label",
+    )
+    parser.add_argument(
+        "--merge-rel-key",
+        action="append",
+        default=[],
+        metavar="PROPERTY",
+        help="Relationship property that is part of its identity in MERGE "
+        "mode (repeatable)",
+    )
+    parser.add_argument(
+        "--on-conflict",
+        choices=["last", "first", "error"],
+        default="last",
+        help="How duplicate elements with different property values are "
+        "merged (default: last)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="Rows per UNWIND batch in MERGE mode, or patterns per CREATE "
+        "in compact mode (default: 1000)",
+    )
+    parser.add_argument(
+        "--schema-report",
+        action="store_true",
+        help="Print the inferred property schema and any type drift",
+    )
+    parser.add_argument(
+        "--csv",
+        metavar="DIR",
+        help="Write CSV files for neo4j-admin import plus a LOAD CSV "
+        "script to DIR instead of Cypher",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        metavar="N",
+        help="Split output into N files that can be loaded in parallel",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["component", "hash"],
+        default="component",
+        help="Partition by connected component (no cross-shard edges) "
+        "or by hashing node ids (default: component)",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="Run a resident conversion server on this Unix socket",
+    )
+    parser.add_argument(
+        "--server",
+        metavar="SOCKET",
+        help="Send the conversion to a server started with --serve",
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="DIR",
+        help="Watch a directory and reconvert files as they change",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Polling interval for --watch (default: 1.0)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=128,
+        metavar="N",
+        help="Maximum number of parsed files, and of included documents, "
+        "kept in memory by --watch and --serve (default: 128)",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Verbose output"
     )
-    return parser.parse_args(args)
+    parsed_args = parser.parse_args(args)
+    if not (parsed_args.yaml_file or parsed_args.serve or parsed_args.watch):
+        parser.error("the following arguments are required: yaml_file")
+    return parsed_args
+
+
+def build_config(parsed_args: argparse.Namespace) -> Dict[str, Any]:
+    """Build the converter configuration from command line arguments.
+
+    Args:
+        parsed_args: Parsed arguments namespace
+
+    Returns:
+        Configuration dictionary for :class:`YAML2Cypher`
+    """
+    return {
+        "fast_yaml": parsed_args.fast_yaml,
+        "vector_properties": parsed_args.vector_property,
+        "vector_precision": parsed_args.vector_precision,
+        "strict_references": parsed_args.strict_references,
+        "relationship_order": (
+            parsed_args.order_relationships.replace("-", "_")
+            if parsed_args.order_relationships
+            else None
+        ),
+        "sort_memory_budget": parsed_args.sort_memory * 1024 * 1024,
+        "mode": (
+            "merge"
+            if parsed_args.merge
+            else "compact" if parsed_args.compact else "create"
+        ),
+        "merge_key": parsed_args.merge_key,
+        "merge_label": parsed_args.merge_label,
+        "merge_relationship_keys": parsed_args.merge_rel_key,
+        "conflict_policy": parsed_args.on_conflict,
+        "batch_size": parsed_args.batch_size,
+        "log_level": logging.DEBUG if parsed_args.verbose else logging.INFO,
+    }
+
+
+def _convert_shards(
+    parsed_args: argparse.Namespace, config: Dict[str, Any]
+) -> int:
+    """Convert the input into one output file per shard.
+
+    Args:
+        parsed_args: Parsed arguments namespace
+        config: Converter configuration
+
+    Returns:
+        Exit code
+    """
+    from yaml2cypher.converter import YAML2Cypher
+
+    converter = YAML2Cypher(config)
+    yaml_data = converter.load_file(parsed_args.yaml_file)
+    shards = converter.convert_yaml_to_shards(
+        yaml_data, parsed_args.shards, parsed_args.shard_by
+    )
+    for shard, statements in enumerate(shards):
+        output = converter.shard_output_path(parsed_args.output, shard)
+        converter.write_cypher_to_file(statements, output)
+        print(f"Converted {parsed_args.yaml_file} shard {shard} to {output}")
+    plan = converter.shard_plan
+    if plan is not None and plan.cut_edges:
+        output = converter.cut_output_path(parsed_args.output)
+        converter.write_cypher_to_file(converter.cut_edges_to_cypher(), output)
+        print(
+            f"{len(plan.cut_edges)} relationship(s) cross shards, "
+            f"linked in {output}:"
+        )
+        for rel in plan.cut_edges[:_MAX_CUT_EDGES_SHOWN]:
+            print(f"  ({rel['from']})-[:{rel['type']}]->({rel['to']})")
+        if len(plan.cut_edges) > _MAX_CUT_EDGES_SHOWN:
+            print("  ...")
+    return 0
 
 
 def main(args: Optional[List[str]] = None) -> int:
@@ -39,10 +255,31 @@ def main(args: Optional[List[str]] = None) -> int:
         Exit code (0 for success, non-zero for errors)
     """
     parsed_args = parse_args(args)
+    config = build_config(parsed_args)
 
-    # Configure logging based on verbosity
-    log_level = logging.DEBUG if parsed_args.verbose else logging.INFO
-    logging.basicConfig(level=log_level)
+    if parsed_args.serve:
+        from yaml2cypher.server import ConversionServer
+
+        print(f"Serving conversions on {parsed_args.serve}")
+        ConversionServer(
+            parsed_args.serve, parsed_args.cache_size
+        ).serve_forever()
+        return 0
+
+    if parsed_args.watch:
+        from yaml2cypher.watch import Watcher
+
+        print(f"Watching {parsed_args.watch} for changes")
+        try:
+            Watcher(
+                parsed_args.watch,
+                config,
+                parsed_args.interval,
+                parsed_args.cache_size,
+            ).run()
+        except KeyboardInterrupt:
+            pass
+        return 0
 
     # Determine output filename if not specified
     if not parsed_args.output:
@@ -50,11 +287,44 @@ def main(args: Optional[List[str]] = None) -> int:
         parsed_args.output = f"{base_name}.cypher"
 
     try:
-        converter = YAML2Cypher()
-        cypher_statements = converter.yaml_file_to_cypher(
-            parsed_args.yaml_file
-        )
-        converter.write_cypher_to_file(cypher_statements, parsed_args.output)
+        if parsed_args.shards:
+            return _convert_shards(parsed_args, config)
+        if parsed_args.csv:
+            from yaml2cypher.converter import YAML2Cypher
+
+            converter = YAML2Cypher(config)
+            files = converter.write_csv_file(
+                parsed_args.yaml_file, parsed_args.csv
+            )
+            print(
+                f"Exported {parsed_args.yaml_file} to {len(files)} file(s) "
+                f"in {parsed_args.csv}"
+            )
+            return 0
+        if parsed_args.server:
+            from yaml2cypher.server import request_conversion
+
+            response = request_conversion(
+                parsed_args.server,
+                parsed_args.yaml_file,
+                parsed_args.output,
+                config,
+            )
+            if not response.get("ok"):
+                raise RuntimeError(response.get("error"))
+        else:
+            from yaml2cypher.converter import YAML2Cypher
+
+            converter = YAML2Cypher(config)
+            cypher_statements = converter.stream_file_to_cypher(
+                parsed_args.yaml_file
+            )
+            converter.write_cypher_to_file(
+                cypher_statements, parsed_args.output
+            )
+            if parsed_args.schema_report:
+                yaml_data = converter.load_file(parsed_args.yaml_file)
+                print(converter.infer_schema(yaml_data).report())
         print(f"Converted {parsed_args.yaml_file} to {parsed_args.output}")
         return 0
     except Exception as e:
@@ -0,0 +1,164 @@
+"""Plan size-bounded chunks of CREATE patterns for compact script output.
+
+Nodes and the relationships between them are grouped into chunks of at
+most ``max_elements`` patterns, each of which becomes one self-contained
+``CREATE (a:...), (b:...), (a)-[:T]->(b)`` statement. Connected components
+(found with :class:`~yaml2cypher.sharding.UnionFind`) are packed whole, in
+input order, so most relationships land in the same chunk as both of their
+endpoints. A component larger than a chunk is split in breadth-first order
+to keep neighbours together; relationships whose endpoints end up in
+different chunks, or that no longer fit, are returned as cut edges to be
+linked separately.
+"""
+
+from collections import deque
+from typing import Any, Dict, List
+
+from yaml2cypher.sharding import UnionFind
+
+
+class Chunk:
+    """Node ids and relationships emitted as one CREATE statement."""
+
+    def __init__(self) -> None:
+        self.nodes: List[Any] = []
+        self.relationships: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.relationships)
+
+
+class ChunkPlan:
+    """Assignment of a graph's elements to CREATE chunks."""
+
+    def __init__(self) -> None:
+        self.chunks: List[Chunk] = []
+        # Relationships left out of the chunks, to be linked by MATCH
+        self.cut_edges: List[Dict[str, Any]] = []
+
+
+class _Component:
+    def __init__(self) -> None:
+        self.nodes: List[Any] = []
+        self.relationships: List[Dict[str, Any]] = []
+
+
+def _bfs_order(component: _Component) -> List[Any]:
+    """Order a component's nodes breadth-first from its first node."""
+    neighbours: Dict[Any, List[Any]] = {
+        node_id: [] for node_id in component.nodes
+    }
+    for rel in component.relationships:
+        neighbours[rel["from"]].append(rel["to"])
+        neighbours[rel["to"]].append(rel["from"])
+    order: List[Any] = []
+    seen = set()
+    for start in component.nodes:
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for other in neighbours[node_id]:
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+    return order
+
+
+def plan_chunks(yaml_data: Dict[str, Any], max_elements: int) -> ChunkPlan:
+    """Group parsed graph data into chunks of CREATE patterns.
+
+    Relationship endpoints that are not defined as nodes are placed like
+    nodes, so relationships sharing them stay together, but they are not
+    part of :attr:`Chunk.nodes`.
+
+    Args:
+        yaml_data: Parsed graph data
+        max_elements: Maximum number of node and relationship patterns
+            per chunk
+
+    Returns:
+        The chunk plan
+
+    Raises:
+        ValueError: If ``max_elements`` is less than 1
+    """
+    if max_elements < 1:
+        raise ValueError("Chunk size must be at least 1")
+    nodes = yaml_data.get("nodes") or {}
+    relationships = [
+        rel
+        for rel in yaml_data.get("relationships") or []
+        if rel.get("from") and rel.get("to") and rel.get("type")
+    ]
+
+    sets = UnionFind()
+    slots: Dict[Any, int] = {}
+    for node_id in nodes:
+        slots[node_id] = sets.add()
+    for rel in relationships:
+        for field in ("from", "to"):
+            if rel[field] not in slots:
+                slots[rel[field]] = sets.add()
+        sets.union(slots[rel["from"]], slots[rel["to"]])
+
+    # Components in order of first appearance
+    components: Dict[int, _Component] = {}
+    for node_id, slot in slots.items():
+        root = sets.find(slot)
+        component = components.get(root)
+        if component is None:
+            component = components[root] = _Component()
+        component.nodes.append(node_id)
+    for rel in relationships:
+        components[sets.find(slots[rel["from"]])].relationships.append(rel)
+
+    plan = ChunkPlan()
+    chunk = Chunk()
+    for component in components.values():
+        size = len(component.relationships) + sum(
+            1 for node_id in component.nodes if node_id in nodes
+        )
+        if size <= max_elements:
+            if len(chunk) + size > max_elements:
+                plan.chunks.append(chunk)
+                chunk = Chunk()
+            chunk.nodes.extend(n for n in component.nodes if n in nodes)
+            chunk.relationships.extend(component.relationships)
+            continue
+
+        # Split an oversized component, adding each relationship with the
+        # later of its two endpoints while the chunk has room
+        if len(chunk):
+            plan.chunks.append(chunk)
+            chunk = Chunk()
+        incident: Dict[Any, List[Dict[str, Any]]] = {}
+        for rel in component.relationships:
+            incident.setdefault(rel["from"], []).append(rel)
+            if rel["to"] != rel["from"]:
+                incident.setdefault(rel["to"], []).append(rel)
+        placed: Dict[Any, int] = {}
+        for node_id in _bfs_order(component):
+            if len(chunk) >= max_elements:
+                plan.chunks.append(chunk)
+                chunk = Chunk()
+            placed[node_id] = len(plan.chunks)
+            if node_id in nodes:
+                chunk.nodes.append(node_id)
+            for rel in incident.get(node_id, ()):
+                other = rel["to"] if rel["from"] == node_id else rel["from"]
+                if other not in placed:
+                    continue
+                if (
+                    placed[other] != placed[node_id]
+                    or len(chunk) >= max_elements
+                ):
+                    plan.cut_edges.append(rel)
+                else:
+                    chunk.relationships.append(rel)
+    if len(chunk):
+        plan.chunks.append(chunk)
+    return plan
@@ -1,7 +1,50 @@
-import yaml
-from typing import Dict, List, Any, Optional
+import functools
+import os
+import re
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
+from yaml2cypher import loaders
+from yaml2cypher.index import DanglingReferenceError, NodeIndex
 from yaml2cypher.utils import setup_logger
+from yaml2cypher.vectors import format_vector, is_vector
+
+# The backends of the optional modes are imported by the methods that use
+# them, so a plain conversion does not pay for loading them.
+if TYPE_CHECKING:  # pragma: no cover
+    from yaml2cypher.csv_export import ElementSource
+    from yaml2cypher.includes import DocumentCache, IncludeResolver
+    from yaml2cypher.merge import Deduplicator
+    from yaml2cypher.ordering import ExternalSorter, SortKey
+    from yaml2cypher.schema import ElementSchema, GraphSchema
+    from yaml2cypher.sharding import ShardPlan
+
+OUTPUT_MODES = ("create", "merge", "compact")
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def _variable(node_id: Any) -> str:
+    """Return a node id as a Cypher variable name.
+
+    Ids that are not plain identifiers, such as numbers or names with
+    dashes, are quoted with backticks.
+    """
+    name = str(node_id)
+    if _IDENTIFIER_RE.match(name):
+        return name
+    return "`" + name.replace("`", "``") + "`"
 
 
 class YAML2Cypher:
@@ -14,7 +57,52 @@ class YAML2Cypher:
             config: Optional configuration dictionary
         """
         self.config = config or {}
-        self.logger = setup_logger("yaml2cypher")
+        self.logger = setup_logger("yaml2cypher", self.config.get("log_level"))
+        # Optional cache of parsed input files, used by long-lived processes
+        self.file_cache: Optional[loaders.FileCache] = None
+        self.shard_plan: Optional["ShardPlan"] = None
+        self._document_cache: Optional["DocumentCache"] = None
+        # Absolute paths of the files included by the last input file
+        self.included_files: Set[str] = set()
+        self._include_resolver: Optional["IncludeResolver"] = None
+        self.vector_properties: Set[str] = set(
+            self.config.get("vector_properties", ())
+        )
+        self.vector_precision: Optional[int] = self.config.get(
+            "vector_precision"
+        )
+        self.node_index = NodeIndex()
+        self.mode: str = self.config.get("mode", "create")
+        if self.mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode: {self.mode}")
+        self.merge_key: str = self.config.get("merge_key", "_id")
+        # Label every node is merged on in MERGE mode, instead of its first
+        self.merge_label: Optional[str] = self.config.get("merge_label")
+        self.batch_size: int = self.config.get("batch_size", 1000)
+        self.deduplicator: Optional["Deduplicator"] = None
+        self.schema: Optional["GraphSchema"] = None
+        self.relationship_order: Optional[str] = self.config.get(
+            "relationship_order"
+        )
+        if self.relationship_order is not None:
+            from yaml2cypher.ordering import RELATIONSHIP_ORDERS
+
+            if self.relationship_order not in RELATIONSHIP_ORDERS:
+                raise ValueError(
+                    f"Unknown relationship order: {self.relationship_order}"
+                )
+
+    @property
+    def document_cache(self) -> "DocumentCache":
+        """Cache of files pulled in through ``include:``, created on use.
+
+        Included files are parsed once per converter.
+        """
+        if self._document_cache is None:
+            from yaml2cypher.includes import DocumentCache
+
+            self._document_cache = DocumentCache(self._parse_file)
+        return self._document_cache
 
     def load_yaml(self, yaml_file: str) -> Dict[str, Any]:
         """Load YAML file and return the parsed content.
@@ -28,6 +116,8 @@ class YAML2Cypher:
         Raises:
             Exception: If the file cannot be read or parsed
         """
+        import yaml
+
         try:
             with open(yaml_file, "r") as f:
                 return yaml.safe_load(f)
@@ -35,6 +125,64 @@ class YAML2Cypher:
             self.logger.error(f"Error loading YAML file {yaml_file}: {e}")
             raise
 
+    def load_file(self, input_file: str) -> Dict[str, Any]:
+        """Load a YAML, JSON or NDJSON graph file.
+
+        The format is detected from the file extension: ``.json`` files
+        are read with the fastest available JSON decoder, ``.ndjson`` and
+        ``.jsonl`` files hold one node or relationship record per line, and
+        everything else is parsed as YAML. Setting the ``fast_yaml``
+        config option parses YAML with the restricted-subset scanner in
+        :mod:`yaml2cypher.fastyaml`.
+
+        Files listed under a top-level ``include`` key are merged in, see
+        :mod:`yaml2cypher.includes`.
+
+        Args:
+            input_file: Path to the input file
+
+        Returns:
+            Parsed content as dictionary
+
+        Raises:
+            Exception: If the file cannot be read or parsed
+        """
+        self.included_files = set()
+        self._include_resolver = None
+        try:
+            if self.file_cache is not None:
+                data = self.file_cache.get(input_file, self._parse_file)
+            else:
+                data = self._parse_file(input_file)
+            resolved: Dict[str, Any] = self._resolve_includes(
+                input_file, data
+            )
+            return resolved
+        except Exception as e:
+            self.logger.error(f"Error loading input file {input_file}: {e}")
+            raise
+
+    def _resolve_includes(self, path: str, data: Any) -> Any:
+        """Merge the files listed under a document's ``include`` key.
+
+        The documents of one input file share a resolver, so a file included
+        by several documents of a stream is merged only once.
+        """
+        if isinstance(data, dict) and data.get("include"):
+            if self._include_resolver is None:
+                from yaml2cypher.includes import IncludeResolver
+
+                self._include_resolver = IncludeResolver(self.document_cache)
+            data = self._include_resolver.resolve(path, data)
+            self.included_files.update(self._include_resolver.included)
+        return data
+
+    def _parse_file(self, path: str) -> Any:
+        """Parse one input file with the configured loader options."""
+        return loaders.load_file(
+            path, fast_yaml=self.config.get("fast_yaml", False)
+        )
+
     def _format_property_value(self, value: Any) -> str:
         """Format a property value for Cypher query.
 
@@ -54,6 +202,8 @@ class YAML2Cypher:
             return str(value).lower()
         elif isinstance(value, (int, float)):
             return str(value)
+        elif is_vector(value):
+            return format_vector(value, self.vector_precision)
         elif isinstance(value, list):
             # Format lists as Cypher arrays
             items = [self._format_property_value(item) for item in value]
@@ -83,7 +233,10 @@ class YAML2Cypher:
 
         props = []
         for key, value in properties.items():
-            formatted_value = self._format_property_value(value)
+            if key in self.vector_properties:
+                formatted_value = self._format_vector_property(key, value)
+            else:
+                formatted_value = self._format_property_value(value)
             props.append(f"{key}: {formatted_value}")
 
         return f"{{{', '.join(props)}}}"
@@ -98,6 +251,10 @@ class YAML2Cypher:
         Returns:
             Cypher CREATE statement for the node
         """
+        return f"CREATE {self._node_pattern(node_id, node_data)}"
+
+    def _node_pattern(self, node_id: str, node_data: Dict[str, Any]) -> str:
+        """Build the ``(id:Label {...})`` pattern of a node."""
         # Extract node labels and properties
         labels = node_data.get("labels", [])
         if isinstance(labels, str):
@@ -110,8 +267,7 @@ class YAML2Cypher:
         properties = {k: v for k, v in node_data.items() if k != "labels"}
         prop_str = self._generate_node_properties(properties)
 
-        # Generate Cypher CREATE statement
-        return f"CREATE ({node_id}{label_str} {prop_str})"
+        return f"({_variable(node_id)}{label_str} {prop_str})"
 
     def _convert_relationship(self, rel_data: Dict[str, Any]) -> str:
         """Convert a relationship definition to Cypher CREATE statement.
@@ -122,15 +278,18 @@ class YAML2Cypher:
         Returns:
             Cypher CREATE statement for the relationship
         """
-        from_node = rel_data.get("from")
-        to_node = rel_data.get("to")
-        rel_type = rel_data.get("type")
-
-        if not all([from_node, to_node, rel_type]):
+        if not all(rel_data.get(field) for field in ("from", "to", "type")):
             self.logger.error(
                 f"Relationship missing required fields: {rel_data}"
             )
             return ""
+        return f"CREATE {self._relationship_pattern(rel_data)}"
+
+    def _relationship_pattern(self, rel_data: Dict[str, Any]) -> str:
+        """Build the ``(a)-[:TYPE {...}]->(b)`` pattern of a relationship."""
+        from_node = rel_data.get("from")
+        to_node = rel_data.get("to")
+        rel_type = rel_data.get("type")
 
         # Extract and format relationship properties
         properties = {
@@ -140,11 +299,294 @@ class YAML2Cypher:
         }
         prop_str = self._generate_node_properties(properties)
 
-        # Generate Cypher CREATE statement for relationship
-        return f"CREATE ({from_node})-[:{rel_type} {prop_str}]->({to_node})"
+        return (
+            f"({_variable(from_node)})-[:{rel_type} {prop_str}]->"
+            f"({_variable(to_node)})"
+        )
 
-    def convert_yaml_to_cypher(self, yaml_data: Dict[str, Any]) -> List[str]:
-        """Convert parsed YAML data to Cypher queries.
+    def _relationship_sort_key(
+        self, rel_data: Dict[str, Any]
+    ) -> "SortKey":
+        """Build the locality sort key of a relationship.
+
+        Endpoints are ordered by their slot in :attr:`node_index`, i.e. the
+        order in which nodes were created, so consecutive relationships
+        touch neighbouring node records. Endpoints whose node has not been
+        seen yet sort after all known nodes, by id.
+
+        Args:
+            rel_data: Relationship data including from, to and type
+
+        Returns:
+            Sort key tuple
+        """
+        key: "SortKey" = ()
+        for field in ("from", "to"):
+            node_id = rel_data.get(field)
+            slot = self.node_index.slot(node_id)
+            key += (sys.maxsize if slot is None else slot, str(node_id))
+        if self.relationship_order == "type_source":
+            key = (str(rel_data.get("type")),) + key
+        return key
+
+    def _new_sorter(self) -> "ExternalSorter":
+        """Create an external sorter using the configured memory budget."""
+        from yaml2cypher.ordering import DEFAULT_MEMORY_BUDGET, ExternalSorter
+
+        return ExternalSorter(
+            self.config.get("sort_memory_budget", DEFAULT_MEMORY_BUDGET),
+            self.config.get("sort_tmp_dir"),
+        )
+
+    def _new_deduplicator(self) -> "Deduplicator":
+        """Create a deduplicator for MERGE mode from the configuration."""
+        from yaml2cypher.merge import Deduplicator
+
+        self.deduplicator = Deduplicator(
+            self.config.get("conflict_policy", "last"),
+            self.config.get("merge_relationship_keys", ()),
+        )
+        return self.deduplicator
+
+    def _batches(self, rows: List[str]) -> Iterator[str]:
+        """Join rows into UNWIND lists of at most ``batch_size`` rows."""
+        for start in range(0, len(rows), self.batch_size):
+            yield ", ".join(rows[start:start + self.batch_size])
+
+    def _format_columns(
+        self, element_schema: "ElementSchema", rows: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Format property maps column by column.
+
+        Args:
+            element_schema: Schema of the group the rows belong to
+            rows: Properties of each element
+
+        Returns:
+            One formatted property map per row, ``{}`` when empty
+        """
+        from yaml2cypher.schema import ColumnTable
+
+        table = ColumnTable(element_schema, self.vector_properties)
+        for properties in rows:
+            table.append(properties)
+        vector_formatters: Dict[str, Callable[[Any], str]] = {
+            name: functools.partial(self._format_vector_property, name)
+            for name in self.vector_properties
+        }
+        return [
+            formatted or "{}"
+            for formatted in table.format_rows(
+                self._format_property_value, vector_formatters
+            )
+        ]
+
+    def _format_vector_property(self, key: str, value: Any) -> str:
+        """Format a value of a property hinted as a vector.
+
+        Args:
+            key: Property name
+            value: Property value; lists become ``vecf32`` literals and
+                anything else is formatted as usual
+
+        Returns:
+            Formatted value as a string for Cypher
+
+        Raises:
+            ValueError: If a list value holds anything but numbers
+        """
+        if not isinstance(value, list):
+            return self._format_property_value(value)
+        try:
+            return format_vector(value, self.vector_precision)
+        except TypeError as e:
+            raise ValueError(
+                f"Vector property {key!r} must only hold numbers: {e}"
+            ) from e
+
+    def _index_statement(self, label: str) -> str:
+        """Return the statement creating the merge key index of a label.
+
+        The index is only created if it does not exist yet, so the output
+        can be loaded again into the same graph.
+        """
+        return (
+            f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) "
+            f"ON (n.{self.merge_key})"
+        )
+
+    def _key_label(self, labels: Iterable[str]) -> str:
+        """Return the label a node is merged and matched on.
+
+        This is ``merge_label`` in MERGE mode when set, and otherwise the
+        node's first label, or an empty string for unlabeled nodes.
+        """
+        if self.mode == "merge" and self.merge_label:
+            return self.merge_label
+        return next(iter(labels), "")
+
+    def _merge_statements(self, dedup: "Deduplicator") -> List[str]:
+        """Generate batched MERGE statements for deduplicated elements.
+
+        An index on the merge key is created for every key label first (see
+        :meth:`_key_label`), so that each MERGE and MATCH is an index
+        lookup. Nodes are then merged per label set on their key label, with
+        the other labels added by ``SET``, and relationships per (type,
+        source label, target label) with ``UNWIND`` batches, and their
+        properties applied with ``SET``.
+
+        Without ``merge_label``, a node whose first label differs between
+        two loads, e.g. ``[Person]`` and then ``[Employee, Person]``, is not
+        matched by the second load and is created again. Set
+        ``merge_label`` to a label shared by every node to avoid this.
+        Property values are laid out in typed columns using the schema
+        inferred from a sample of each group, recorded in :attr:`schema`.
+
+        Args:
+            dedup: Deduplicator holding the nodes and relationships
+
+        Returns:
+            List of Cypher statements
+        """
+        from yaml2cypher.schema import (
+            DEFAULT_SAMPLE_SIZE,
+            ElementSchema,
+            GraphSchema,
+        )
+
+        key = self.merge_key
+        sample_size = self.config.get(
+            "schema_sample_size", DEFAULT_SAMPLE_SIZE
+        )
+        statements = []
+        self.node_index = NodeIndex()
+        self.schema = GraphSchema()
+
+        node_groups: Dict[tuple, List[Tuple[Any, Dict[str, Any]]]] = {}
+        for node_id, (node_labels, properties) in dedup.nodes.items():
+            self.node_index.add_node(node_id)
+            node_groups.setdefault(tuple(node_labels), []).append(
+                (node_id, properties)
+            )
+
+        if self.config.get("merge_indexes", True):
+            seen = set()
+            for labels in node_groups:
+                label = self._key_label(labels)
+                if label and label not in seen:
+                    seen.add(label)
+                    statements.append(self._index_statement(label))
+
+        for labels, members in node_groups.items():
+            element_schema = self.schema.nodes[labels] = ElementSchema()
+            for _, properties in members:
+                element_schema.observe(
+                    properties, element_schema.count < sample_size
+                )
+            props = self._format_columns(
+                element_schema, [properties for _, properties in members]
+            )
+            rows = [
+                f"{{key: {self._format_property_value(node_id)}, "
+                f"props: {node_props}}}"
+                for (node_id, _), node_props in zip(members, props)
+            ]
+            # Merge on the indexed key label and add the others after
+            label = self._key_label(labels)
+            key_label = f":{label}" if label else ""
+            extra_labels = "".join(
+                f"n:{other}, " for other in labels if other != label
+            )
+            for batch in self._batches(rows):
+                statements.append(
+                    f"UNWIND [{batch}] AS row "
+                    f"MERGE (n{key_label} {{{key}: row.key}}) "
+                    f"SET {extra_labels}n += row.props"
+                )
+
+        rel_groups: Dict[tuple, List[Tuple[Dict[str, Any], str]]] = {}
+        for rel_data in dedup.relationships.values():
+            from_node, to_node = rel_data["from"], rel_data["to"]
+            self.node_index.add_relationship(from_node, to_node)
+            key_names = tuple(
+                name for name in dedup.relationship_keys if name in rel_data
+            )
+            group = (
+                rel_data["type"],
+                self._key_label(dedup.node_labels(from_node) or ()),
+                self._key_label(dedup.node_labels(to_node) or ()),
+                key_names,
+            )
+            row_key = self._generate_node_properties(
+                {name: rel_data[name] for name in key_names}
+            )
+            rel_groups.setdefault(group, []).append(
+                (rel_data, row_key or "{}")
+            )
+
+        for (rel_type, from_label, to_label, key_names), rel_members in (
+            rel_groups.items()
+        ):
+            element_schema = self.schema.relationships.setdefault(
+                str(rel_type), ElementSchema()
+            )
+            group_schema = ElementSchema()
+            properties_list = []
+            for rel_data, _ in rel_members:
+                properties = {
+                    k: v
+                    for k, v in rel_data.items()
+                    if k not in ("from", "to", "type") and k not in key_names
+                }
+                element_schema.observe(
+                    properties, element_schema.count < sample_size
+                )
+                group_schema.observe(
+                    properties, group_schema.count < sample_size
+                )
+                properties_list.append(properties)
+            props = self._format_columns(group_schema, properties_list)
+            rows = [
+                f"{{from: {self._format_property_value(rel_data['from'])}, "
+                f"to: {self._format_property_value(rel_data['to'])}, "
+                f"key: {row_key}, props: {rel_props}}}"
+                for (rel_data, row_key), rel_props in zip(rel_members, props)
+            ]
+
+            from_str = f":{from_label}" if from_label else ""
+            to_str = f":{to_label}" if to_label else ""
+            key_str = ", ".join(
+                f"{name}: row.key.{name}" for name in key_names
+            )
+            key_str = f" {{{key_str}}}" if key_str else ""
+            for batch in self._batches(rows):
+                statements.append(
+                    f"UNWIND [{batch}] AS row "
+                    f"MATCH (a{from_str} {{{key}: row.from}}) "
+                    f"MATCH (b{to_str} {{{key}: row.to}}) "
+                    f"MERGE (a)-[r:{rel_type}{key_str}]->(b) "
+                    f"SET r += row.props"
+                )
+
+        if dedup.duplicate_nodes or dedup.duplicate_relationships:
+            self.logger.info(
+                f"Merged {dedup.duplicate_nodes} duplicate node(s) and "
+                f"{dedup.duplicate_relationships} duplicate relationship(s)"
+            )
+        self._check_references()
+        return statements
+
+    def _compact_statements(self, yaml_data: Dict[str, Any]) -> List[str]:
+        """Generate coalesced CREATE statements for compact script mode.
+
+        Nodes and relationships are packed into chunks of at most
+        ``batch_size`` patterns, keeping connected components together (see
+        :func:`yaml2cypher.compact.plan_chunks`), and each chunk becomes a
+        single ``CREATE`` that only uses variables it binds itself. Nodes
+        store their id in the ``merge_key`` property; relationships that
+        could not stay in a chunk with both endpoints are linked afterwards
+        with batched ``MATCH ... CREATE`` statements on that property,
+        preceded by index creation.
 
         Args:
             yaml_data: Parsed YAML data
@@ -152,51 +594,628 @@ class YAML2Cypher:
         Returns:
             List of Cypher statements
         """
-        cypher_statements = []
+        key = self.merge_key
+        nodes = yaml_data.get("nodes") or {}
+        self.node_index = NodeIndex()
+        for node_id in nodes:
+            self.node_index.add_node(node_id)
+        for rel_data in yaml_data.get("relationships") or []:
+            if not all(rel_data.get(f) for f in ("from", "to", "type")):
+                self.logger.error(
+                    f"Relationship missing required fields: {rel_data}"
+                )
+                continue
+            self.node_index.add_relationship(rel_data["from"], rel_data["to"])
+
+        from yaml2cypher.compact import plan_chunks
+
+        plan = plan_chunks(yaml_data, self.batch_size)
+        statements = []
+        for chunk in plan.chunks:
+            patterns = [
+                self._node_pattern(node_id, {key: node_id, **nodes[node_id]})
+                for node_id in chunk.nodes
+            ]
+            patterns.extend(
+                self._relationship_pattern(rel_data)
+                for rel_data in chunk.relationships
+            )
+            statements.append(f"CREATE {', '.join(patterns)}")
+
+        statements.extend(self._link_statements(plan.cut_edges, nodes))
+        self._check_references()
+        return statements
+
+    def _link_statements(
+        self,
+        relationships: List[Dict[str, Any]],
+        nodes: Dict[Any, Any],
+    ) -> List[str]:
+        """Link relationships between nodes created by other statements.
+
+        Endpoints are looked up by the ``merge_key`` property, using the
+        key label (see :meth:`_key_label`) of each endpoint in ``nodes``,
+        with batched ``UNWIND ... MATCH`` statements per (type, source
+        label, target label), preceded by index creation. In MERGE mode the
+        relationships are merged rather than created, so the links can be
+        loaded again.
+
+        Args:
+            relationships: Relationships to link
+            nodes: Node data of the whole graph, for endpoint labels
+
+        Returns:
+            List of Cypher statements
+        """
+        key = self.merge_key
+        verb = "MERGE" if self.mode == "merge" else "CREATE"
 
-        # Process nodes section
-        nodes = yaml_data.get("nodes", {})
-        for node_id, node_data in nodes.items():
-            cypher_statements.append(self._convert_node(node_id, node_data))
+        def key_label(node_id: Any) -> str:
+            labels = (nodes.get(node_id) or {}).get("labels") or []
+            if isinstance(labels, str):
+                labels = [labels]
+            return str(self._key_label(labels))
 
-        # Process relationships section
-        relationships = yaml_data.get("relationships", [])
+        rel_groups: Dict[Tuple[Any, str, str], List[str]] = {}
         for rel_data in relationships:
-            cypher_statements.append(self._convert_relationship(rel_data))
+            group = (
+                rel_data["type"],
+                key_label(rel_data["from"]),
+                key_label(rel_data["to"]),
+            )
+            props = self._generate_node_properties(
+                {
+                    k: v
+                    for k, v in rel_data.items()
+                    if k not in ("from", "to", "type")
+                }
+            )
+            rel_groups.setdefault(group, []).append(
+                f"{{from: {self._format_property_value(rel_data['from'])}, "
+                f"to: {self._format_property_value(rel_data['to'])}, "
+                f"props: {props or '{}'}}}"
+            )
+
+        statements: List[str] = []
+        if rel_groups and self.config.get("merge_indexes", True):
+            labels = {label for _, a, b in rel_groups for label in (a, b)}
+            labels.discard("")
+            statements.extend(
+                self._index_statement(label) for label in sorted(labels)
+            )
+        for (rel_type, from_label, to_label), rows in rel_groups.items():
+            from_str = f":{from_label}" if from_label else ""
+            to_str = f":{to_label}" if to_label else ""
+            for batch in self._batches(rows):
+                statements.append(
+                    f"UNWIND [{batch}] AS row "
+                    f"MATCH (a{from_str} {{{key}: row.from}}) "
+                    f"MATCH (b{to_str} {{{key}: row.to}}) "
+                    f"{verb} (a)-[r:{rel_type}]->(b) SET r += row.props"
+                )
+        return statements
+
+    def _add_to_deduplicator(
+        self, dedup: "Deduplicator", rel_data: Dict[str, Any]
+    ) -> None:
+        """Add a relationship to the deduplicator if it is well-formed."""
+        if not all(rel_data.get(field) for field in ("from", "to", "type")):
+            self.logger.error(
+                f"Relationship missing required fields: {rel_data}"
+            )
+            return
+        dedup.add_relationship(rel_data)
 
+    def _check_references(self) -> None:
+        """Report relationships whose endpoints were never defined.
+
+        Raises:
+            DanglingReferenceError: If dangling references exist and the
+                ``strict_references`` config option is set
+        """
+        dangling = self.node_index.dangling()
+        if not dangling:
+            return
+        count = sum(len(ordinals) for ordinals in dangling.values())
+        missing = ", ".join(sorted(str(node_id) for node_id in dangling))
+        message = (
+            f"{count} relationship endpoint(s) reference undefined nodes: "
+            f"{missing}"
+        )
+        if self.config.get("strict_references", False):
+            raise DanglingReferenceError(message)
+        self.logger.warning(message)
+
+    def convert_yaml_to_cypher(self, yaml_data: Dict[str, Any]) -> List[str]:
+        """Convert parsed YAML data to Cypher queries.
+
+        Node ids are collected in :attr:`node_index` while nodes are
+        converted, and every relationship endpoint is checked against it.
+        Dangling references are reported once conversion finishes.
+
+        With the ``relationship_order`` config option set to ``"source"``
+        or ``"type_source"``, relationship statements are emitted sorted by
+        (type and) source node instead of input order, using an external
+        sort bounded by ``sort_memory_budget`` bytes.
+
+        With the ``mode`` config option set to ``"merge"``, nodes and
+        relationships are deduplicated first (see
+        :class:`yaml2cypher.merge.Deduplicator`) and emitted as batched,
+        idempotent ``MERGE ... SET`` statements keyed on the ``merge_key``
+        property (default ``_id``), preceded by index creation. With
+        ``"compact"``, nodes and relationships are coalesced into
+        self-contained ``CREATE`` pattern lists, see
+        :meth:`_compact_statements`.
+
+        Args:
+            yaml_data: Parsed YAML data
+
+        Returns:
+            List of Cypher statements
+
+        Raises:
+            DanglingReferenceError: If relationships reference undefined
+                nodes and the ``strict_references`` config option is set
+        """
+        if self.mode == "merge":
+            dedup = self._new_deduplicator()
+            self._deduplicate_graph(dedup, yaml_data)
+            return self._merge_statements(dedup)
+        if self.mode == "compact":
+            return self._compact_statements(yaml_data)
+
+        self.node_index = NodeIndex()
+        sorter = self._new_sorter() if self.relationship_order else None
+        try:
+            cypher_statements = list(self._convert_graph(yaml_data, sorter))
+            self._check_references()
+            if sorter is not None:
+                cypher_statements.extend(sorter)
+        finally:
+            if sorter is not None:
+                sorter.close()
         return cypher_statements
 
+    def _deduplicate_graph(
+        self, dedup: "Deduplicator", yaml_data: Dict[str, Any]
+    ) -> None:
+        """Add the nodes and relationships of one document to dedup."""
+        for node_id, node_data in (yaml_data.get("nodes") or {}).items():
+            dedup.add_node(node_id, node_data)
+        for rel_data in yaml_data.get("relationships") or []:
+            self._add_to_deduplicator(dedup, rel_data)
+
+    def _convert_graph(
+        self,
+        yaml_data: Dict[str, Any],
+        sorter: Optional["ExternalSorter"],
+    ) -> Iterator[str]:
+        """Convert the nodes and relationships of one document.
+
+        Node ids are added to :attr:`node_index` without resetting it, so
+        relationships can refer to nodes of earlier documents.
+
+        Args:
+            yaml_data: Parsed graph document
+            sorter: Sorter that takes the relationship statements, if any
+
+        Yields:
+            Node statements, then relationship statements unless sorted
+        """
+        for node_id, node_data in (yaml_data.get("nodes") or {}).items():
+            self.node_index.add_node(node_id)
+            yield self._convert_node(node_id, node_data)
+
+        for rel_data in yaml_data.get("relationships") or []:
+            statement = self._convert_relationship(rel_data)
+            if statement:
+                self.node_index.add_relationship(
+                    rel_data["from"], rel_data["to"]
+                )
+            if sorter is not None:
+                sorter.add(self._relationship_sort_key(rel_data), statement)
+            else:
+                yield statement
+
+    def convert_documents(
+        self, documents: Iterable[Dict[str, Any]]
+    ) -> Iterator[str]:
+        """Convert a stream of graph documents to Cypher queries.
+
+        Documents are pulled from the iterable one at a time and all of a
+        document's statements are yielded before the next one is requested,
+        so with a lazy iterable (see :func:`loaders.iter_yaml_documents`)
+        only one document is held in memory. Node ids are resolved across
+        documents: relationships may refer to nodes of earlier or later
+        documents, and references still unresolved at the end of the stream
+        are reported after the last statement. When ``relationship_order``
+        is set, relationship statements are held back in an external sort
+        and yielded at the end. In MERGE mode, elements are deduplicated
+        across documents and the statements are yielded at the end; in
+        compact mode, the documents are merged and coalesced at the end.
+
+        Args:
+            documents: Iterable of parsed graph documents
+
+        Yields:
+            Cypher statements
+
+        Raises:
+            DanglingReferenceError: If relationships reference undefined
+                nodes and the ``strict_references`` config option is set
+        """
+        if self.mode == "merge":
+            dedup = self._new_deduplicator()
+            for document in documents:
+                if isinstance(document, dict):
+                    self._deduplicate_graph(dedup, document)
+            yield from self._merge_statements(dedup)
+            return
+        if self.mode == "compact":
+            graph = loaders.merge_documents(documents)
+            yield from self._compact_statements(graph)
+            return
+
+        self.node_index = NodeIndex()
+        sorter = self._new_sorter() if self.relationship_order else None
+        try:
+            for document in documents:
+                if isinstance(document, dict):
+                    yield from self._convert_graph(document, sorter)
+            self._check_references()
+            if sorter is not None:
+                yield from sorter
+        finally:
+            if sorter is not None:
+                sorter.close()
+
+    def convert_records(
+        self, records: Iterable[Dict[str, Any]]
+    ) -> Iterator[str]:
+        """Convert a stream of NDJSON-style records to Cypher queries.
+
+        Node records carry their identifier under ``id``; relationship
+        records carry ``from``, ``to`` and ``type``. Statements are yielded
+        in record order. Relationships may arrive before the nodes they
+        reference; references still unresolved at the end of the stream
+        are reported after the last statement. When ``relationship_order``
+        is set, relationship statements are held back in an external sort
+        and yielded after all node statements. In MERGE mode, duplicate
+        records are merged and the statements are yielded at the end; in
+        compact mode, the records are collected and coalesced at the end.
+
+        Args:
+            records: Iterable of node and relationship records
+
+        Yields:
+            Cypher statements
+
+        Raises:
+            DanglingReferenceError: If relationships reference undefined
+                nodes and the ``strict_references`` config option is set
+        """
+        if self.mode == "merge":
+            dedup = self._new_deduplicator()
+            for record in records:
+                if loaders.is_relationship_record(record):
+                    self._add_to_deduplicator(dedup, record)
+                else:
+                    dedup.add_node(*loaders.split_node_record(record))
+            yield from self._merge_statements(dedup)
+            return
+        if self.mode == "compact":
+            graph: Dict[str, Any] = {"nodes": {}, "relationships": []}
+            for record in records:
+                if loaders.is_relationship_record(record):
+                    graph["relationships"].append(record)
+                else:
+                    node_id, node_data = loaders.split_node_record(record)
+                    graph["nodes"][node_id] = node_data
+            yield from self._compact_statements(graph)
+            return
+
+        self.node_index = NodeIndex()
+        sorter = self._new_sorter() if self.relationship_order else None
+        try:
+            for record in records:
+                if loaders.is_relationship_record(record):
+                    statement = self._convert_relationship(record)
+                    if statement:
+                        self.node_index.add_relationship(
+                            record["from"], record["to"]
+                        )
+                    if sorter is not None:
+                        sorter.add(
+                            self._relationship_sort_key(record), statement
+                        )
+                    else:
+                        yield statement
+                else:
+                    node_id, node_data = loaders.split_node_record(record)
+                    self.node_index.add_node(node_id)
+                    yield self._convert_node(node_id, node_data)
+            self._check_references()
+            if sorter is not None:
+                yield from sorter
+        finally:
+            if sorter is not None:
+                sorter.close()
+
     def yaml_file_to_cypher(self, yaml_file: str) -> List[str]:
-        """Convert a YAML file to Cypher queries.
+        """Convert a YAML, JSON or NDJSON file to Cypher queries.
 
         Args:
-            yaml_file: Path to the YAML file
+            yaml_file: Path to the input file
 
         Returns:
             List of Cypher statements
         """
-        yaml_data = self.load_yaml(yaml_file)
-        return self.convert_yaml_to_cypher(yaml_data)
+        return list(self.stream_file_to_cypher(yaml_file))
+
+    def stream_file_to_cypher(self, yaml_file: str) -> Iterator[str]:
+        """Convert a YAML, JSON or NDJSON file, yielding statements lazily.
+
+        NDJSON files are converted record by record and multi-document YAML
+        streams document by document, so statements can be written out
+        before the rest of the file is parsed. Other files are loaded whole.
+
+        Args:
+            yaml_file: Path to the input file
+
+        Yields:
+            Cypher statements
+        """
+        self.included_files = set()
+        self._include_resolver = None
+        fmt = loaders.detect_format(yaml_file)
+        if fmt == "ndjson":
+            statements = self.convert_records(loaders.iter_ndjson(yaml_file))
+        elif fmt == "yaml" and loaders.is_yaml_stream(yaml_file):
+            statements = self.convert_documents(
+                self._iter_documents(yaml_file)
+            )
+        else:
+            yield from self.convert_yaml_to_cypher(self.load_file(yaml_file))
+            return
+        try:
+            yield from statements
+        except Exception as e:
+            self.logger.error(f"Error loading input file {yaml_file}: {e}")
+            raise
+
+    def _iter_documents(self, yaml_file: str) -> Iterator[Any]:
+        """Lazily parse a YAML stream, merging each document's includes."""
+        self._include_resolver = None
+        for document in loaders.iter_yaml_documents(yaml_file):
+            yield self._resolve_includes(yaml_file, document)
+
+    def convert_yaml_to_shards(
+        self,
+        yaml_data: Dict[str, Any],
+        shard_count: int,
+        strategy: str = "component",
+    ) -> List[List[str]]:
+        """Convert parsed YAML data to Cypher queries split into shards.
+
+        The partitioning is kept in :attr:`shard_plan`; with the ``"hash"``
+        strategy, relationships crossing shards are listed in its
+        ``cut_edges`` and left out of the shards. Their endpoint nodes store
+        their id in the ``merge_key`` property so that
+        :meth:`cut_edges_to_cypher` can link them afterwards.
+
+        Args:
+            yaml_data: Parsed YAML data
+            shard_count: Number of shards
+            strategy: ``"component"`` or ``"hash"``, see
+                :func:`yaml2cypher.sharding.plan_shards`
+
+        Returns:
+            One list of Cypher statements per shard
+        """
+        from yaml2cypher.sharding import plan_shards
+
+        plan = self.shard_plan = plan_shards(yaml_data, shard_count, strategy)
+        if plan.cut_edges:
+            self.logger.warning(
+                f"{len(plan.cut_edges)} relationship(s) cross shards and "
+                "are linked separately"
+            )
+        if self.mode == "create":
+            # MERGE and compact output already store every node's id
+            key = self.merge_key
+            for rel_data in plan.cut_edges:
+                for node_id in (rel_data["from"], rel_data["to"]):
+                    shard = plan.shards[plan.node_shard[node_id]]
+                    shard_nodes = shard["nodes"]
+                    node_data = shard_nodes.get(node_id)
+                    if node_data is not None and key not in node_data:
+                        shard_nodes[node_id] = {key: node_id, **node_data}
+        return [self.convert_yaml_to_cypher(shard) for shard in plan.shards]
+
+    def cut_edges_to_cypher(self) -> List[str]:
+        """Link the relationships left out by :meth:`convert_yaml_to_shards`.
+
+        The statements match both endpoints by the ``merge_key`` property,
+        so they are meant to run once every shard is loaded into one graph.
+
+        Returns:
+            List of Cypher statements, empty when no relationship crosses
+            shards
+        """
+        plan = self.shard_plan
+        if plan is None or not plan.cut_edges:
+            return []
+        nodes: Dict[Any, Any] = {}
+        for shard in plan.shards:
+            nodes.update(shard["nodes"])
+        return self._link_statements(plan.cut_edges, nodes)
+
+    @staticmethod
+    def shard_output_path(output_file: str, shard: int) -> str:
+        """Return the output path of one shard.
+
+        Args:
+            output_file: Path of the unsharded output file
+            shard: Shard number
+
+        Returns:
+            ``<base>.shard<N><ext>`` next to the output file
+        """
+        base, ext = os.path.splitext(output_file)
+        return f"{base}.shard{shard}{ext}"
+
+    @staticmethod
+    def cut_output_path(output_file: str) -> str:
+        """Return the output path of the cross-shard relationship links.
+
+        Args:
+            output_file: Path of the unsharded output file
+
+        Returns:
+            ``<base>.cut<ext>`` next to the output file
+        """
+        base, ext = os.path.splitext(output_file)
+        return f"{base}.cut{ext}"
+
+    def infer_schema(self, yaml_data: Dict[str, Any]) -> "GraphSchema":
+        """Infer the per-label and per-type property schema of graph data.
+
+        Args:
+            yaml_data: Parsed YAML data
+
+        Returns:
+            The inferred schema, also stored in :attr:`schema`
+        """
+        from yaml2cypher.schema import DEFAULT_SAMPLE_SIZE, infer_schema
+
+        self.schema = infer_schema(
+            yaml_data,
+            self.config.get("schema_sample_size", DEFAULT_SAMPLE_SIZE),
+        )
+        return self.schema
+
+    def write_csv(
+        self, yaml_data: Dict[str, Any], directory: str
+    ) -> List[str]:
+        """Write parsed YAML data as CSV files for bulk import.
+
+        Node ids are stored in the ``merge_key`` property. Relationship
+        endpoints are checked against :attr:`node_index` as in
+        :meth:`convert_yaml_to_cypher`.
+
+        Args:
+            yaml_data: Parsed YAML data
+            directory: Output directory for the CSV files and ``load.cypher``
+
+        Returns:
+            Paths of the written files
+
+        Raises:
+            DanglingReferenceError: If a relationship references an undefined
+                node and ``strict_references`` is set; nothing is written
+        """
+        from yaml2cypher.csv_export import graph_elements
+
+        return self._write_csv(
+            lambda: graph_elements([yaml_data]), directory
+        )
+
+    def write_csv_file(self, input_file: str, directory: str) -> List[str]:
+        """Write a YAML, JSON or NDJSON file as CSV files for bulk import.
+
+        The input is read twice, once to infer the column types and once to
+        write the rows. NDJSON files and multi-document YAML streams are
+        streamed on both passes; other files are loaded whole once.
+
+        Args:
+            input_file: Path to the input file
+            directory: Output directory for the CSV files and ``load.cypher``
+
+        Returns:
+            Paths of the written files
+
+        Raises:
+            DanglingReferenceError: If a relationship references an undefined
+                node and ``strict_references`` is set; nothing is written
+        """
+        from yaml2cypher.csv_export import graph_elements, record_elements
+
+        fmt = loaders.detect_format(input_file)
+        if fmt == "ndjson":
+            return self._write_csv(
+                lambda: record_elements(loaders.iter_ndjson(input_file)),
+                directory,
+            )
+        if fmt == "yaml" and loaders.is_yaml_stream(input_file):
+            self.included_files = set()
+            return self._write_csv(
+                lambda: graph_elements(self._iter_documents(input_file)),
+                directory,
+            )
+        yaml_data = self.load_file(input_file)
+        return self.write_csv(yaml_data, directory)
+
+    def _write_csv(
+        self, elements: "ElementSource", directory: str
+    ) -> List[str]:
+        """Export graph elements with :class:`CSVExporter`."""
+        from yaml2cypher.csv_export import CSVExporter
+
+        exporter = CSVExporter(
+            directory,
+            id_property=self.merge_key,
+            chunk_size=self.batch_size,
+        )
+        self.node_index = NodeIndex()
+        files = exporter.export_elements(
+            elements, self.node_index, self._check_references
+        )
+        self.schema = exporter.schema
+        for entry in self.schema.drift():
+            self.logger.warning(
+                f"Mixed value types exported as strings: {entry}"
+            )
+        self.logger.info(f"CSV files written to {directory}")
+        return files
 
     def write_cypher_to_file(
-        self, cypher_statements: List[str], output_file: str
+        self, cypher_statements: Iterable[str], output_file: str
     ) -> None:
         """Write Cypher statements to a file.
 
+        Statements are written to a temporary file next to the output, which
+        replaces it only once every statement was produced, so an input
+        error leaves an existing output file untouched.
+
         Args:
-            cypher_statements: List of Cypher statements
+            cypher_statements: Cypher statements, written as they are
+                produced when given an iterator
             output_file: Path to the output file
 
         Raises:
-            Exception: If the file cannot be written
+            Exception: If the statements cannot be produced or the file
+                cannot be written
         """
+        temp_file = f"{output_file}.{os.getpid()}.tmp"
+        # Only errors raised while writing, not while producing statements,
+        # are reported as write errors
+        writing = False
         try:
-            with open(output_file, "w") as f:
+            writing = True
+            with open(temp_file, "w") as f:
+                writing = False
                 for statement in cypher_statements:
+                    writing = True
                     f.write(f"{statement};\n")
-            self.logger.info(f"Cypher queries written to {output_file}")
-        except Exception as e:
-            self.logger.error(
-                f"Error writing Cypher to file {output_file}: {e}"
-            )
+                    writing = False
+                writing = True
+            os.replace(temp_file, output_file)
+        except BaseException as e:
+            if writing:
+                self.logger.error(
+                    f"Error writing Cypher to file {output_file}: {e}"
+                )
+            if os.path.exists(temp_file):
+                os.unlink(temp_file)
             raise
+        self.logger.info(f"Cypher queries written to {output_file}")
@@ -0,0 +1,458 @@
+"""CSV output for ``neo4j-admin database import`` and ``LOAD CSV``.
+
+Nodes are written to one CSV file per label set and relationships to one
+file per type, with typed headers in the ``neo4j-admin`` format (``:ID``,
+``:LABEL``, ``:START_ID``, ``:END_ID``, ``:TYPE``, ``name:long``,
+``tags:string[]``, ...). A companion ``load.cypher`` script loads the same
+files with ``LOAD CSV``. The input is read in two passes: the first infers
+the column types from every element, since a header cannot change once rows
+are written, and the second streams the rows out, formatted column by column
+in chunks of bounded size.
+"""
+
+import csv
+import json
+import os
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from yaml2cypher.schema import (
+    ColumnTable,
+    ElementSchema,
+    GraphSchema,
+    PropertySchema,
+)
+
+DEFAULT_CHUNK_SIZE = 10000
+ARRAY_DELIMITER = ";"
+
+_NEO4J_TYPES = {
+    "integer": "long",
+    "float": "double",
+    "boolean": "boolean",
+    "string": "string",
+}
+
+# LOAD CSV conversion of a raw field, by neo4j-admin type
+_CONVERSIONS = {
+    "long": "toInteger({})",
+    "double": "toFloat({})",
+    "boolean": "({} = 'true')",
+    "string": "{}",
+}
+
+
+def neo4j_type(prop: PropertySchema) -> str:
+    """Return the ``neo4j-admin`` header type of a property.
+
+    Args:
+        prop: Inferred schema of the property
+
+    Returns:
+        Header type such as ``long`` or ``string[]``; mixed and nested
+        values are exported as JSON strings
+    """
+    kind = prop.column_kind
+    if kind in _NEO4J_TYPES:
+        return _NEO4J_TYPES[kind]
+    if prop.value_types == ["list"] and len(prop.element_types) == 1:
+        element = next(iter(prop.element_types))
+        if element in _NEO4J_TYPES:
+            return _NEO4J_TYPES[element] + "[]"
+    return "string"
+
+
+def _csv_scalar(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, str)):
+        return str(value)
+    return json.dumps(value)
+
+
+def format_csv_value(value: Any) -> str:
+    """Format a value of a generic column as a CSV field.
+
+    Args:
+        value: Property value
+
+    Returns:
+        Lists of scalars joined with the array delimiter; maps and nested
+        lists as JSON
+    """
+    if isinstance(value, list) and not any(
+        isinstance(item, (list, dict)) for item in value
+    ):
+        return ARRAY_DELIMITER.join(_csv_scalar(item) for item in value)
+    return _csv_scalar(value)
+
+
+def _file_name(prefix: str, parts: Tuple[str, ...], taken: Set[str]) -> str:
+    """Return a CSV file name such as ``nodes_Person_Employee.csv``.
+
+    Names already in ``taken`` (compared without case, for case-insensitive
+    file systems) get a numeric suffix, so label sets that sanitize to the
+    same name, like ``("A_B",)`` and ``("A", "B")``, get separate files.
+    """
+    stem = re.sub(r"[^A-Za-z0-9_.-]", "_", "_".join((prefix,) + parts))
+    name = f"{stem}.csv"
+    suffix = 1
+    while name.lower() in taken:
+        suffix += 1
+        name = f"{stem}_{suffix}.csv"
+    taken.add(name.lower())
+    return name
+
+
+def _shared_label(labels: Set[str]) -> str:
+    if len(labels) == 1 and "" not in labels:
+        return f":{next(iter(labels))}"
+    return ""
+
+
+# A node ``("node", id, labels, properties)`` or a relationship
+# ``("rel", from, to, type, properties)``
+Element = Tuple[Any, ...]
+ElementSource = Callable[[], Iterable[Element]]
+
+
+def _node_labels(node_data: Dict[str, Any]) -> Tuple[str, ...]:
+    labels = node_data.get("labels", [])
+    if isinstance(labels, str):
+        labels = [labels]
+    return tuple(labels)
+
+
+def _rel_properties(rel_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: v for k, v in rel_data.items() if k not in ("from", "to", "type")
+    }
+
+
+def graph_elements(documents: Iterable[Any]) -> Iterator[Element]:
+    """Yield the nodes, then the relationships, of each graph document.
+
+    Relationships missing ``from``, ``to`` or ``type`` are skipped.
+    """
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        for node_id, node_data in (document.get("nodes") or {}).items():
+            yield (
+                "node",
+                node_id,
+                _node_labels(node_data),
+                {k: v for k, v in node_data.items() if k != "labels"},
+            )
+        for rel_data in document.get("relationships") or []:
+            if all(rel_data.get(f) for f in ("from", "to", "type")):
+                yield (
+                    "rel",
+                    rel_data["from"],
+                    rel_data["to"],
+                    str(rel_data["type"]),
+                    _rel_properties(rel_data),
+                )
+
+
+def record_elements(records: Iterable[Dict[str, Any]]) -> Iterator[Element]:
+    """Yield the elements of NDJSON-style node and relationship records."""
+    from yaml2cypher import loaders
+
+    for record in records:
+        if not loaders.is_relationship_record(record):
+            node_id, node_data = loaders.split_node_record(record)
+            yield (
+                "node",
+                node_id,
+                _node_labels(node_data),
+                {k: v for k, v in node_data.items() if k != "labels"},
+            )
+        elif all(record.get(f) for f in ("from", "to", "type")):
+            yield (
+                "rel",
+                record["from"],
+                record["to"],
+                str(record["type"]),
+                _rel_properties(record),
+            )
+
+
+class _CSVGroup:
+    """The CSV file of one label set or relationship type.
+
+    Rows are buffered and appended to the file when flushed, so the file is
+    only open while a chunk is written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fixed: List[str],
+        lead: int,
+        schema: ElementSchema,
+    ) -> None:
+        # The first ``lead`` fixed columns precede the property columns
+        self.lead = lead
+        self.path = path
+        self.schema = schema
+        self.names = list(schema.properties)
+        self.types = [neo4j_type(schema.properties[n]) for n in self.names]
+        self.fixed_rows: List[List[str]] = []
+        self.table = ColumnTable(schema)
+        self.rows = 0
+        header = [
+            f"{name}:{kind}" for name, kind in zip(self.names, self.types)
+        ]
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerow(fixed[:lead] + header + fixed[lead:])
+
+    def append(self, fixed: List[str], properties: Dict[str, Any]) -> None:
+        self.fixed_rows.append(fixed)
+        self.table.append(properties)
+        self.rows += 1
+
+    def flush(self) -> None:
+        if not self.fixed_rows:
+            return
+        columns = self.table.format_csv_columns(self.names, format_csv_value)
+        with open(self.path, "a", newline="") as f:
+            writer = csv.writer(f)
+            for i, fixed in enumerate(self.fixed_rows):
+                writer.writerow(
+                    fixed[:self.lead]
+                    + [column[i] for column in columns]
+                    + fixed[self.lead:]
+                )
+        self.fixed_rows = []
+        self.table = ColumnTable(self.schema)
+
+
+class CSVExporter:
+    """Write graph elements as typed CSV files plus a LOAD CSV script.
+
+    The elements are read twice: a first pass infers the column types of
+    every file from all values, and a second pass streams the rows out.
+    At most ``chunk_size`` rows are buffered at a time, across all files,
+    and no file is kept open between chunks. Only the first label of every
+    node id is kept in memory, to match relationship endpoints.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        id_property: str = "_id",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the exporter.
+
+        Args:
+            directory: Output directory, created if needed
+            id_property: Property that stores node ids (``<name>:ID``)
+            chunk_size: Rows buffered before they are formatted and written
+        """
+        self.directory = directory
+        self.id_property = id_property
+        self.chunk_size = chunk_size
+        self.files: List[str] = []
+        # Schema of the last export, inferred from every element
+        self.schema = GraphSchema()
+
+    def export(
+        self,
+        yaml_data: Dict[str, Any],
+        node_index: Optional[Any] = None,
+        before_write: Optional[Callable[[], None]] = None,
+    ) -> List[str]:
+        """Write parsed graph data as CSV files and the companion script.
+
+        Args:
+            yaml_data: Parsed graph data
+            node_index: Optional :class:`~yaml2cypher.index.NodeIndex` to
+                fill in the first pass
+            before_write: Called after the first pass, before any file is
+                written, e.g. to check references
+
+        Returns:
+            Paths of the written files, the script last
+        """
+        return self.export_elements(
+            lambda: graph_elements([yaml_data]), node_index, before_write
+        )
+
+    def export_elements(
+        self,
+        elements: ElementSource,
+        node_index: Optional[Any] = None,
+        before_write: Optional[Callable[[], None]] = None,
+    ) -> List[str]:
+        """Write a stream of graph elements as CSV files and the script.
+
+        Args:
+            elements: Function returning a fresh iterable of the elements
+                (see :func:`graph_elements` and :func:`record_elements`);
+                it is called once per pass
+            node_index: Optional :class:`~yaml2cypher.index.NodeIndex` to
+                fill in the first pass
+            before_write: Called after the first pass, before any file is
+                written, e.g. to check references
+
+        Returns:
+            Paths of the written files, the script last
+        """
+        schema = self.schema = GraphSchema()
+        first_label: Dict[Any, str] = {}
+        for element in elements():
+            if element[0] == "node":
+                _, node_id, labels, properties = element
+                group_schema = schema.nodes.setdefault(
+                    labels, ElementSchema()
+                )
+                first_label[node_id] = labels[0] if labels else ""
+                if node_index is not None:
+                    node_index.add_node(node_id)
+            else:
+                _, from_node, to_node, rel_type, properties = element
+                group_schema = schema.relationships.setdefault(
+                    rel_type, ElementSchema()
+                )
+                if node_index is not None:
+                    node_index.add_relationship(from_node, to_node)
+            group_schema.observe(properties, True)
+        if before_write is not None:
+            before_write()
+
+        os.makedirs(self.directory, exist_ok=True)
+        taken: Set[str] = set()
+        node_groups = {
+            labels: _CSVGroup(
+                os.path.join(
+                    self.directory, _file_name("nodes", labels, taken)
+                ),
+                [f"{self.id_property}:ID", ":LABEL"],
+                1,
+                group_schema,
+            )
+            for labels, group_schema in schema.nodes.items()
+        }
+        rel_groups = {
+            rel_type: _CSVGroup(
+                os.path.join(
+                    self.directory, _file_name("rels", (rel_type,), taken)
+                ),
+                [":START_ID", ":END_ID", ":TYPE"],
+                3,
+                group_schema,
+            )
+            for rel_type, group_schema in schema.relationships.items()
+        }
+        groups = list(node_groups.values()) + list(rel_groups.values())
+        endpoint_labels: Dict[str, Tuple[Set[str], Set[str]]] = {
+            rel_type: (set(), set()) for rel_type in rel_groups
+        }
+
+        buffered = 0
+        for element in elements():
+            if element[0] == "node":
+                _, node_id, labels, properties = element
+                node_groups[labels].append(
+                    [str(node_id), ARRAY_DELIMITER.join(labels)], properties
+                )
+            else:
+                _, from_node, to_node, rel_type, properties = element
+                sources, targets = endpoint_labels[rel_type]
+                sources.add(first_label.get(from_node, ""))
+                targets.add(first_label.get(to_node, ""))
+                rel_groups[rel_type].append(
+                    [str(from_node), str(to_node), rel_type], properties
+                )
+            buffered += 1
+            if buffered >= self.chunk_size:
+                for group in groups:
+                    group.flush()
+                buffered = 0
+        for group in groups:
+            group.flush()
+            self.files.append(group.path)
+
+        script = os.path.join(self.directory, "load.cypher")
+        with open(script, "w") as f:
+            for statement in self._load_script(
+                node_groups, rel_groups, endpoint_labels
+            ):
+                f.write(f"{statement};\n")
+        self.files.append(script)
+        return self.files
+
+    def _property_map(self, group: _CSVGroup) -> str:
+        props = []
+        for name, kind in zip(group.names, group.types):
+            field = f"row.`{name}:{kind}`"
+            if kind.endswith("[]"):
+                conversion = _CONVERSIONS[kind[:-2]].format("v")
+                value = (
+                    f"[v IN split({field}, '{ARRAY_DELIMITER}') "
+                    f"| {conversion}]"
+                )
+            else:
+                value = _CONVERSIONS[kind].format(field)
+            props.append(f"{name}: {value}")
+        return ", ".join(props)
+
+    def _load_script(
+        self,
+        node_groups: Dict[Tuple[str, ...], _CSVGroup],
+        rel_groups: Dict[str, _CSVGroup],
+        endpoint_labels: Dict[str, Tuple[Set[str], Set[str]]],
+    ) -> List[str]:
+        """Build the LOAD CSV statements for the written files."""
+        key = self.id_property
+        statements = []
+        seen: Set[str] = set()
+        for labels in node_groups:
+            for label in labels:
+                if label not in seen:
+                    seen.add(label)
+                    statements.append(
+                        f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) "
+                        f"ON (n.{key})"
+                    )
+
+        for labels, group in node_groups.items():
+            label_str = "".join(f":{label}" for label in labels)
+            props = self._property_map(group)
+            props = f", {props}" if props else ""
+            statements.append(
+                f"LOAD CSV WITH HEADERS FROM "
+                f"'file:///{os.path.basename(group.path)}' AS row "
+                f"CREATE (n{label_str} {{{key}: row.`{key}:ID`{props}}})"
+            )
+
+        for rel_type, group in rel_groups.items():
+            sources, targets = endpoint_labels[rel_type]
+            # Match on a label only when every endpoint shares it, so the
+            # lookup can use the index on the id property
+            source = _shared_label(sources)
+            target = _shared_label(targets)
+            props = self._property_map(group)
+            props = f" {{{props}}}" if props else ""
+            statements.append(
+                f"LOAD CSV WITH HEADERS FROM "
+                f"'file:///{os.path.basename(group.path)}' AS row "
+                f"MATCH (a{source} {{{key}: row.`:START_ID`}}) "
+                f"MATCH (b{target} {{{key}: row.`:END_ID`}}) "
+                f"CREATE (a)-[:{rel_type}{props}]->(b)"
+            )
+        return statements
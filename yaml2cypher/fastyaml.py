@@ -0,0 +1,261 @@
+"""Fast scanner for the restricted YAML subset used by graph exports.
+
+Graph files almost always use plain block mappings and sequences of simple
+scalars. This module parses exactly that subset straight from an ``mmap`` of
+the file and raises :class:`UnsupportedYAML` as soon as it meets anything
+else (flow collections, anchors, tags, block scalars, escapes, multi-line or
+ambiguous scalars, ...). :func:`load_fast` catches that and falls back to
+``yaml.safe_load``, so callers always get the same data PyYAML would return.
+"""
+
+import mmap
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Characters that make a plain scalar mean something other than a string,
+# or that PyYAML resolves in ways the scanner does not reproduce.
+_SPECIAL_START = set("-?:,[]{}#&*!|>'\"%@`=<.+~0123456789")
+
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9][0-9]*)\Z")
+_FLOAT_RE = re.compile(r"[-+]?[0-9]+\.[0-9]+\Z")
+
+_NULLS = {"", "~", "null", "Null", "NULL"}
+_BOOLS: Dict[str, bool] = {}
+for _word, _value in (
+    ("true", True), ("false", False), ("yes", True),
+    ("no", False), ("on", True), ("off", False),
+):
+    for _form in (_word, _word.capitalize(), _word.upper()):
+        _BOOLS[_form] = _value
+
+# Anything outside YAML's printable set, plus the NEL, LS and PS characters
+# that PyYAML treats as line breaks
+_UNSUPPORTED_CHARS = re.compile(
+    "[^\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufffd"
+    "\U00010000-\U0010ffff]"
+)
+
+Line = Tuple[int, str]
+
+
+class UnsupportedYAML(Exception):
+    """Raised when the input uses YAML outside the supported subset."""
+
+
+def _resolve_plain(text: str) -> Any:
+    """Resolve a plain (unquoted) scalar the way ``yaml.safe_load`` does."""
+    if text in _NULLS:
+        return None
+    if text in _BOOLS:
+        return _BOOLS[text]
+    if _INT_RE.match(text):
+        return int(text)
+    if _FLOAT_RE.match(text):
+        return float(text)
+    if (
+        text[0] in _SPECIAL_START
+        or text.endswith(":")
+        or ": " in text
+        or " #" in text
+        or "\t" in text
+    ):
+        raise UnsupportedYAML(f"ambiguous plain scalar: {text!r}")
+    return text
+
+
+def _strip_trailing(rest: str) -> None:
+    """Check that only whitespace or a comment follows a quoted scalar."""
+    stripped = rest.lstrip(" ")
+    if stripped and not (stripped[0] == "#" and len(stripped) < len(rest)):
+        raise UnsupportedYAML(f"unexpected text after scalar: {rest!r}")
+
+
+def _parse_scalar(text: str) -> Any:
+    """Parse a single-line scalar value."""
+    if text[0] == '"':
+        end = text.find('"', 1)
+        if end < 0 or "\\" in text[:end]:
+            raise UnsupportedYAML(f"unsupported double-quoted: {text!r}")
+        _strip_trailing(text[end + 1:])
+        return text[1:end]
+    if text[0] == "'":
+        pos = 1
+        while True:
+            end = text.find("'", pos)
+            if end < 0:
+                raise UnsupportedYAML(f"unterminated quote: {text!r}")
+            if text[end + 1:end + 2] == "'":
+                pos = end + 2
+                continue
+            break
+        _strip_trailing(text[end + 1:])
+        return text[1:end].replace("''", "'")
+    return _resolve_plain(text.rstrip(" "))
+
+
+def _split_key(content: str) -> Optional[Tuple[Any, str]]:
+    """Split ``key: value`` content, or return None for a bare scalar."""
+    if content[0] in "'\"":
+        return None
+    colon = content.find(": ")
+    if colon < 0:
+        if not content.endswith(":"):
+            return None
+        colon = len(content) - 1
+    key = _resolve_plain(content[:colon].rstrip(" "))
+    if key is None:
+        raise UnsupportedYAML(f"empty key: {content!r}")
+    return key, content[colon + 1:].strip(" ")
+
+
+def _is_seq_item(content: str) -> bool:
+    return content == "-" or content.startswith("- ")
+
+
+class _Parser:
+    """Indentation-driven parser over pre-split ``(indent, text)`` lines."""
+
+    def __init__(self, lines: List[Line]) -> None:
+        self.lines = lines
+        self.pos = 0
+
+    def parse_document(self) -> Any:
+        if not self.lines or self.lines[0][0] != 0:
+            raise UnsupportedYAML("document must start at column 0")
+        value = self._parse_block(0)
+        if self.pos != len(self.lines):
+            raise UnsupportedYAML("trailing content after document")
+        return value
+
+    def _parse_block(self, indent: int) -> Any:
+        if _is_seq_item(self.lines[self.pos][1]):
+            return self._parse_sequence(indent)
+        return self._parse_mapping(indent)
+
+    def _parse_nested(self, indent: int, allow_seq: bool) -> Any:
+        """Parse the block value that follows a ``key:`` or ``-`` line."""
+        if self.pos >= len(self.lines):
+            return None
+        next_indent, content = self.lines[self.pos]
+        if next_indent > indent:
+            return self._parse_block(next_indent)
+        if allow_seq and next_indent == indent and _is_seq_item(content):
+            return self._parse_sequence(indent)
+        return None
+
+    def _parse_mapping(self, indent: int) -> Dict[Any, Any]:
+        result: Dict[Any, Any] = {}
+        while self.pos < len(self.lines):
+            line_indent, content = self.lines[self.pos]
+            if line_indent < indent:
+                break
+            if line_indent > indent or _is_seq_item(content):
+                raise UnsupportedYAML(f"unexpected line: {content!r}")
+            split = _split_key(content)
+            if split is None:
+                raise UnsupportedYAML(f"expected a mapping key: {content!r}")
+            key, value = split
+            self.pos += 1
+            if value:
+                result[key] = _parse_scalar(value)
+            else:
+                result[key] = self._parse_nested(indent, allow_seq=True)
+        return result
+
+    def _parse_sequence(self, indent: int) -> List[Any]:
+        result: List[Any] = []
+        while self.pos < len(self.lines):
+            line_indent, content = self.lines[self.pos]
+            if line_indent < indent:
+                break
+            if line_indent > indent:
+                raise UnsupportedYAML(f"unexpected line: {content!r}")
+            if not _is_seq_item(content):
+                break
+            rest = content[1:].lstrip(" ")
+            if not rest:
+                self.pos += 1
+                result.append(self._parse_nested(indent, allow_seq=False))
+            elif _is_seq_item(rest) or _split_key(rest) is not None:
+                # Compact nested block: re-read the item as a block that
+                # starts at the column of its first character.
+                item_indent = indent + len(content) - len(rest)
+                self.lines[self.pos] = (item_indent, rest)
+                result.append(self._parse_block(item_indent))
+            else:
+                self.pos += 1
+                result.append(_parse_scalar(rest))
+        return result
+
+
+def _split_lines(buf: "mmap.mmap") -> List[Line]:
+    """Split a mapped buffer into significant ``(indent, text)`` lines."""
+    lines: List[Line] = []
+    size = len(buf)
+    start = 0
+    while start < size:
+        end = buf.find(b"\n", start)
+        if end < 0:
+            end = size
+        raw = buf[start:end]
+        start = end + 1
+        if b"\r" in raw or b"\t" in raw:
+            raise UnsupportedYAML("tabs and CR line endings not supported")
+        text = raw.decode("utf-8").rstrip(" ")
+        if _UNSUPPORTED_CHARS.search(text):
+            raise UnsupportedYAML("non-printable or line break character")
+        content = text.lstrip(" ")
+        if not content or content[0] == "#":
+            continue
+        indent = len(text) - len(content)
+        if indent == 0 and (
+            content.startswith("---")
+            or content.startswith("...")
+            or content[0] == "%"
+        ):
+            raise UnsupportedYAML("document markers not supported")
+        if content[0] == "\ufeff":
+            raise UnsupportedYAML("byte order mark not supported")
+        lines.append((indent, content))
+    return lines
+
+
+def scan_file(path: str) -> Any:
+    """Parse a restricted-subset YAML file through a memory map.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        The parsed document
+
+    Raises:
+        UnsupportedYAML: If the file uses constructs outside the subset
+    """
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            raise UnsupportedYAML("empty file")
+        with buf:
+            lines = _split_lines(buf)
+    return _Parser(lines).parse_document()
+
+
+def load_fast(path: str) -> Any:
+    """Load a YAML file with the fast scanner, falling back to PyYAML.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        The parsed document, identical to ``yaml.safe_load`` output
+    """
+    try:
+        return scan_file(path)
+    except (UnsupportedYAML, UnicodeDecodeError):
+        import yaml
+
+        with open(path, "r") as f:
+            return yaml.safe_load(f)
@@ -0,0 +1,158 @@
+"""Resolve ``include:`` sections that merge other graph files.
+
+A graph file may list other files, or glob patterns, under a top-level
+``include`` key. Paths are relative to the including file. The nodes and
+relationships of included files are merged before the file's own, so a file
+can refer to node ids defined in the files it includes. Included files are
+parsed once per run through a bounded cache keyed by the SHA-256 of their
+content, however many roots include them.
+"""
+
+import glob
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+Loader = Callable[[str], Any]
+
+
+class IncludeCycleError(ValueError):
+    """Raised when files include each other in a cycle."""
+
+
+class DocumentCache:
+    """Content-addressed LRU cache of parsed documents."""
+
+    def __init__(self, loader: Loader, max_entries: int = 128) -> None:
+        """Initialize the cache.
+
+        Args:
+            loader: Function that parses a file given its path
+            max_entries: Maximum number of parsed documents to keep
+        """
+        self.loader = loader
+        self.max_entries = max_entries
+        self._documents: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, path: str) -> Any:
+        """Return the parsed content of a file.
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            Parsed document, shared with every file of identical content
+        """
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        document = self._documents.get(digest)
+        if document is not None:
+            self._documents.move_to_end(digest)
+            self.hits += 1
+            return document
+        self.misses += 1
+        document = self.loader(path)
+        self._documents[digest] = document
+        while len(self._documents) > self.max_entries:
+            self._documents.popitem(last=False)
+        return document
+
+
+def _include_patterns(document: Any) -> List[str]:
+    if not isinstance(document, dict):
+        return []
+    patterns = document.get("include") or []
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return list(patterns)
+
+
+def _expand(pattern: str, base_dir: str) -> List[str]:
+    """Expand an include pattern relative to the including file."""
+    full = os.path.join(base_dir, os.path.expanduser(pattern))
+    if not glob.has_magic(full):
+        if not os.path.exists(full):
+            raise FileNotFoundError(f"Included file not found: {pattern}")
+        return [os.path.abspath(full)]
+    return sorted(
+        os.path.abspath(path) for path in glob.glob(full, recursive=True)
+    )
+
+
+class IncludeResolver:
+    """Merge graph files with the files they include."""
+
+    def __init__(self, cache: DocumentCache) -> None:
+        """Initialize the resolver.
+
+        Args:
+            cache: Cache used to parse included files
+        """
+        self.cache = cache
+        # Absolute paths of the files included by any resolve call so far
+        self.included: Set[str] = set()
+
+    def resolve(
+        self, path: str, document: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Return a file's graph data merged with everything it includes.
+
+        Each included file is merged at most once per resolver, so a file
+        included along several paths, or by several documents of a stream
+        resolved with the same resolver, contributes its elements once.
+
+        Args:
+            path: Path to the root file
+            document: Already parsed content of the root file, if known
+
+        Returns:
+            Merged graph data with ``nodes`` and ``relationships``
+
+        Raises:
+            IncludeCycleError: If the include graph contains a cycle
+            FileNotFoundError: If a non-glob include does not exist
+        """
+        root = os.path.abspath(path)
+        merged: Dict[str, Any] = {"nodes": {}, "relationships": []}
+        done = set(self.included)
+        done.discard(root)
+        self._merge(root, document, merged, [], done)
+        self.included = done - {root}
+        return merged
+
+    def _merge(
+        self,
+        path: str,
+        document: Optional[Dict[str, Any]],
+        merged: Dict[str, Any],
+        stack: List[str],
+        done: Set[str],
+    ) -> None:
+        if path in stack:
+            chain = " -> ".join(stack[stack.index(path):] + [path])
+            raise IncludeCycleError(f"Include cycle: {chain}")
+        if path in done:
+            return
+        if document is None:
+            document = self.cache.get(path)
+        if not isinstance(document, dict):
+            done.add(path)
+            return
+
+        stack.append(path)
+        base_dir = os.path.dirname(path)
+        for pattern in _include_patterns(document):
+            for included in _expand(pattern, base_dir):
+                if included != path:
+                    self._merge(included, None, merged, stack, done)
+        stack.pop()
+        done.add(path)
+
+        merged["nodes"].update(document.get("nodes") or {})
+        merged["relationships"].extend(document.get("relationships") or [])
@@ -0,0 +1,119 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class DanglingReferenceError(ValueError):
+    """Raised when relationships reference nodes that were never defined."""
+
+
+class NodeIndex:
+    """Symbol table of node identifiers built during conversion.
+
+    Each node id is mapped to a dense integer slot, and per-node out- and
+    in-degrees are kept in parallel integer arrays. Relationship endpoints
+    are checked with a single dictionary lookup as they are converted.
+    Endpoints that are not known yet are parked as pending references and
+    resolved when the node arrives, so relationships may precede their
+    nodes in streamed input. Ids can be any hashable value, such as the
+    integer keys YAML produces for numeric node ids.
+    """
+
+    def __init__(self) -> None:
+        self._slots: Dict[Any, int] = {}
+        self._out_degree = array("L")
+        self._in_degree = array("L")
+        # Unknown node id -> [out-degree, in-degree, relationship ordinals]
+        self._pending: Dict[Any, Tuple[List[int], List[int]]] = {}
+        self.relationship_count = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._slots
+
+    def add_node(self, node_id: Any) -> int:
+        """Register a node and return its slot.
+
+        Args:
+            node_id: Identifier of the node
+
+        Returns:
+            Integer slot of the node
+        """
+        slot = self._slots.get(node_id)
+        if slot is not None:
+            return slot
+        slot = len(self._slots)
+        self._slots[node_id] = slot
+        degrees, _ = self._pending.pop(node_id, ([0, 0], []))
+        self._out_degree.append(degrees[0])
+        self._in_degree.append(degrees[1])
+        return slot
+
+    def _count(self, node_id: Any, direction: int, ordinal: int) -> None:
+        slot = self._slots.get(node_id)
+        if slot is not None:
+            if direction == 0:
+                self._out_degree[slot] += 1
+            else:
+                self._in_degree[slot] += 1
+            return
+        degrees, ordinals = self._pending.setdefault(node_id, ([0, 0], []))
+        degrees[direction] += 1
+        ordinals.append(ordinal)
+
+    def add_relationship(self, from_node: Any, to_node: Any) -> None:
+        """Record a relationship between two nodes.
+
+        Args:
+            from_node: Identifier of the source node
+            to_node: Identifier of the target node
+        """
+        ordinal = self.relationship_count
+        self.relationship_count += 1
+        self._count(from_node, 0, ordinal)
+        self._count(to_node, 1, ordinal)
+
+    def slot(self, node_id: Any) -> Optional[int]:
+        """Return the slot of a node, or None if it is not known yet.
+
+        Args:
+            node_id: Identifier of the node
+
+        Returns:
+            Integer slot in node definition order, or None
+        """
+        return self._slots.get(node_id)
+
+    def degree(self, node_id: Any) -> Tuple[int, int]:
+        """Return the (out-degree, in-degree) of a node.
+
+        Args:
+            node_id: Identifier of the node
+
+        Returns:
+            Tuple of out-degree and in-degree
+
+        Raises:
+            KeyError: If the node is unknown
+        """
+        slot = self._slots[node_id]
+        return self._out_degree[slot], self._in_degree[slot]
+
+    def degrees(self) -> Iterator[Tuple[Any, int, int]]:
+        """Iterate over (node id, out-degree, in-degree) for every node."""
+        for node_id, slot in self._slots.items():
+            yield node_id, self._out_degree[slot], self._in_degree[slot]
+
+    def dangling(self) -> Dict[Any, List[int]]:
+        """Return the references that are still unresolved.
+
+        Returns:
+            Mapping of each missing node id to the ordinals of the
+            relationships that reference it
+        """
+        return {
+            node_id: ordinals
+            for node_id, (_, ordinals) in self._pending.items()
+        }
@@ -0,0 +1,375 @@
+import os
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+JSONDecoder = Callable[[Union[str, bytes]], Any]
+_json_decoder: Optional[JSONDecoder] = None
+
+
+def json_decoder() -> JSONDecoder:
+    """Return the fastest JSON decoder that is installed.
+
+    The decoder is picked on first use, so YAML conversions do not pay for
+    importing it. All of them accept ``bytes`` so NDJSON lines can be
+    decoded without an intermediate str.
+    """
+    global _json_decoder
+    if _json_decoder is None:
+        try:
+            import orjson  # type: ignore
+
+            _json_decoder = orjson.loads
+        except ImportError:  # pragma: no cover - depends on the environment
+            try:
+                import ujson  # type: ignore
+
+                _json_decoder = ujson.loads
+            except ImportError:
+                import json
+
+                _json_decoder = json.loads
+    return _json_decoder
+
+
+YAML_EXTENSIONS = (".yaml", ".yml")
+JSON_EXTENSIONS = (".json",)
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+
+def detect_format(path: str) -> str:
+    """Detect the input format of a graph file from its extension.
+
+    Args:
+        path: Path to the input file
+
+    Returns:
+        One of ``"yaml"``, ``"json"`` or ``"ndjson"``. Unknown extensions
+        are treated as YAML.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in JSON_EXTENSIONS:
+        return "json"
+    if ext in NDJSON_EXTENSIONS:
+        return "ndjson"
+    return "yaml"
+
+
+def load_yaml_file(path: str, fast: bool = False) -> Dict[str, Any]:
+    """Load a YAML graph file.
+
+    The documents of a multi-document stream are merged into one graph with
+    :func:`merge_documents`; use :func:`iter_yaml_documents` to process
+    them one at a time instead.
+
+    Args:
+        path: Path to the YAML file
+        fast: Use the restricted-subset scanner, falling back to PyYAML
+            for anything it does not support
+
+    Returns:
+        Parsed YAML content as dictionary
+    """
+    data: Dict[str, Any]
+    if fast:
+        from yaml2cypher import fastyaml
+
+        try:
+            data = fastyaml.scan_file(path)
+            return data
+        except (fastyaml.UnsupportedYAML, UnicodeDecodeError):
+            pass
+
+    import yaml
+
+    try:
+        with open(path, "r") as f:
+            data = yaml.safe_load(f)
+            return data
+    except yaml.composer.ComposerError as e:
+        # Only raised once a second document has been reached, so single
+        # documents are parsed once
+        if e.problem != "but found another document":
+            raise
+    return merge_documents(iter_yaml_documents(path))
+
+
+def is_yaml_stream(path: str) -> bool:
+    """Check whether a YAML file holds more than one document.
+
+    Only document start markers (``---`` at the start of a line) are
+    looked at, so the file is read line by line without being parsed.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        True if a document start follows content or another document start
+    """
+    started = False
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"---") and not line[3:4].strip():
+                if started:
+                    return True
+                started = True
+            elif not started and line.strip()[:1] not in (b"", b"#", b"%"):
+                started = True
+    return False
+
+
+def iter_yaml_documents(path: str) -> Iterator[Any]:
+    """Lazily parse the documents of a multi-document YAML stream.
+
+    Each document is parsed only when the previous one has been consumed,
+    so memory use is bounded by the largest document.
+
+    Args:
+        path: Path to the YAML file
+
+    Yields:
+        Parsed documents, skipping empty ones
+    """
+    import yaml
+
+    with open(path, "r") as f:
+        for document in yaml.safe_load_all(f):
+            if document is not None:
+                yield document
+
+
+def merge_documents(documents: Iterable[Any]) -> Dict[str, Any]:
+    """Merge the documents of a stream into one graph.
+
+    Args:
+        documents: Parsed graph documents
+
+    Returns:
+        Graph data with the nodes, relationships and includes of every
+        document; later documents override nodes with the same id
+    """
+    merged: Dict[str, Any] = {"nodes": {}, "relationships": []}
+    includes: List[str] = []
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        merged["nodes"].update(document.get("nodes") or {})
+        merged["relationships"].extend(document.get("relationships") or [])
+        patterns = document.get("include") or []
+        includes.extend([patterns] if isinstance(patterns, str) else patterns)
+    if includes:
+        merged["include"] = includes
+    return merged
+
+
+def load_json_file(path: str) -> Dict[str, Any]:
+    """Load a JSON graph file using the fastest available decoder.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Parsed JSON content as dictionary
+    """
+    with open(path, "rb") as f:
+        data: Dict[str, Any] = json_decoder()(f.read())
+    return data
+
+
+def is_relationship_record(record: Dict[str, Any]) -> bool:
+    """Check whether an NDJSON record describes a relationship.
+
+    Args:
+        record: A decoded NDJSON record
+
+    Returns:
+        True for relationship records, False for node records. A record
+        with an ``id`` is a relationship only when it also has ``from``,
+        ``to`` and ``type`` and no ``labels``, so relationship exports may
+        carry their own id while nodes may have ``from`` and ``to``
+        properties.
+
+    Raises:
+        ValueError: If a record has an ``id``, ``labels``, ``from``, ``to``
+            and ``type``, and could be either
+    """
+    if "from" not in record or "to" not in record:
+        return False
+    if "id" not in record:
+        return True
+    if "type" not in record:
+        return False
+    if "labels" in record:
+        raise ValueError(
+            "Record could be a node or a relationship, it has id, labels, "
+            f"from, to and type: {record}"
+        )
+    return True
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the records of a line-delimited JSON graph file.
+
+    Each non-blank line holds one record: either a node, which carries its
+    identifier under ``id``, or a relationship, which carries ``from``,
+    ``to`` and ``type`` like the ``relationships`` section of a YAML file.
+
+    Args:
+        path: Path to the NDJSON file
+
+    Yields:
+        Decoded records, one per line
+
+    Raises:
+        ValueError: If a line does not decode to a JSON object
+    """
+    loads = json_decoder()
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(
+                    f"{path}:{line_no}: expected a JSON object per line"
+                )
+            yield record
+
+
+def split_node_record(
+    record: Dict[str, Any]
+) -> Tuple[Any, Dict[str, Any]]:
+    """Split an NDJSON node record into its identifier and node data.
+
+    Args:
+        record: A decoded node record
+
+    Returns:
+        Tuple of the node identifier, kept as it is so that it matches
+        relationship endpoints of the same type, and the remaining node
+        data
+
+    Raises:
+        ValueError: If the record has no ``id``
+    """
+    if "id" not in record:
+        raise ValueError(f"Node record missing 'id': {record}")
+    node_data = dict(record)
+    node_id = node_data.pop("id")
+    return node_id, node_data
+
+
+def load_ndjson_file(path: str) -> Dict[str, Any]:
+    """Load a whole NDJSON graph file into the nodes/relationships layout.
+
+    Args:
+        path: Path to the NDJSON file
+
+    Returns:
+        Dictionary with ``nodes`` and ``relationships`` sections
+
+    Raises:
+        ValueError: If a node record has no ``id``
+    """
+    nodes: Dict[Any, Any] = {}
+    relationships = []
+    for record in iter_ndjson(path):
+        if is_relationship_record(record):
+            relationships.append(record)
+        else:
+            node_id, node_data = split_node_record(record)
+            nodes[node_id] = node_data
+    return {"nodes": nodes, "relationships": relationships}
+
+
+def load_file(path: str, fast_yaml: bool = False) -> Dict[str, Any]:
+    """Load a graph file, choosing the parser from its extension.
+
+    Args:
+        path: Path to a YAML, JSON or NDJSON file
+        fast_yaml: Use the fast scanner for YAML input
+
+    Returns:
+        Parsed content as dictionary
+    """
+    fmt = detect_format(path)
+    if fmt == "json":
+        return load_json_file(path)
+    if fmt == "ndjson":
+        return load_ndjson_file(path)
+    return load_yaml_file(path, fast=fast_yaml)
+
+
+class FileCache:
+    """Bounded LRU cache of parsed files.
+
+    Entries are keyed by path and revalidated against the file's
+    modification time and size, so a changed file is parsed again while
+    unchanged files are served from memory.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of parsed files to keep
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        path: str,
+        loader: Callable[[str], Any],
+        stat: Optional[os.stat_result] = None,
+    ) -> Any:
+        """Return the parsed content of a file, loading it on a miss.
+
+        Args:
+            path: Path to the file
+            loader: Function that parses the file
+            stat: Optional ``os.stat`` result of the file, if already known
+
+        Returns:
+            Parsed file content
+        """
+        path = os.path.abspath(path)
+        if stat is None:
+            stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        content = loader(path)
+        self._entries[path] = (signature, content)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return content
+
+    def discard(self, path: str) -> None:
+        """Drop a file from the cache.
+
+        Args:
+            path: Path to the file
+        """
+        self._entries.pop(os.path.abspath(path), None)
@@ -0,0 +1,135 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CONFLICT_POLICIES = ("last", "first", "error")
+
+NodeEntry = Tuple[List[str], Dict[str, Any]]
+RelationshipKey = Tuple[Any, ...]
+
+
+class MergeConflictError(ValueError):
+    """Raised when duplicate elements disagree under the "error" policy."""
+
+
+def _freeze(value: Any) -> Any:
+    """Turn a property value into something hashable."""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _labels(node_data: Dict[str, Any]) -> List[str]:
+    labels = node_data.get("labels", [])
+    if isinstance(labels, str):
+        labels = [labels]
+    return list(labels)
+
+
+class Deduplicator:
+    """Collapse duplicate nodes and relationships before MERGE output.
+
+    Nodes are identified by their id and relationships by (from, type, to)
+    plus the values of the configured key properties. When an element is
+    seen again, labels are unioned and properties are merged according to
+    the conflict policy: ``"last"`` keeps the newest value, ``"first"`` the
+    oldest, and ``"error"`` raises :class:`MergeConflictError` when the
+    values differ.
+    """
+
+    def __init__(
+        self,
+        policy: str = "last",
+        relationship_keys: Iterable[str] = (),
+    ) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            policy: Conflict policy, one of :data:`CONFLICT_POLICIES`
+            relationship_keys: Property names that, with (from, type, to),
+                identify a relationship
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy: {policy}")
+        self.policy = policy
+        self.relationship_keys = tuple(relationship_keys)
+        self.nodes: Dict[Any, NodeEntry] = {}
+        self.relationships: Dict[RelationshipKey, Dict[str, Any]] = {}
+        self.duplicate_nodes = 0
+        self.duplicate_relationships = 0
+
+    def _merge_properties(
+        self, existing: Dict[str, Any], new: Dict[str, Any], what: str
+    ) -> None:
+        for key, value in new.items():
+            if key not in existing:
+                existing[key] = value
+            elif existing[key] != value:
+                if self.policy == "error":
+                    raise MergeConflictError(
+                        f"Conflicting values for {key!r} on {what}: "
+                        f"{existing[key]!r} != {value!r}"
+                    )
+                if self.policy == "last":
+                    existing[key] = value
+
+    def add_node(self, node_id: Any, node_data: Dict[str, Any]) -> None:
+        """Add a node, merging it into an earlier one with the same id.
+
+        Args:
+            node_id: Identifier of the node
+            node_data: Node data including labels and properties
+        """
+        properties = {k: v for k, v in node_data.items() if k != "labels"}
+        entry = self.nodes.get(node_id)
+        if entry is None:
+            self.nodes[node_id] = (_labels(node_data), properties)
+            return
+        self.duplicate_nodes += 1
+        labels, existing = entry
+        for label in _labels(node_data):
+            if label not in labels:
+                labels.append(label)
+        self._merge_properties(existing, properties, f"node {node_id}")
+
+    def relationship_key(self, rel_data: Dict[str, Any]) -> RelationshipKey:
+        """Return the identity of a relationship.
+
+        Args:
+            rel_data: Relationship data including from, to and type
+
+        Returns:
+            Tuple of from, type, to and the key property values
+        """
+        return (
+            rel_data["from"],
+            rel_data["type"],
+            rel_data["to"],
+        ) + tuple(
+            (name, _freeze(rel_data[name]))
+            for name in self.relationship_keys
+            if name in rel_data
+        )
+
+    def add_relationship(self, rel_data: Dict[str, Any]) -> None:
+        """Add a relationship, merging it into an identical earlier one.
+
+        Args:
+            rel_data: Relationship data including from, to and type
+        """
+        key = self.relationship_key(rel_data)
+        existing = self.relationships.get(key)
+        if existing is None:
+            self.relationships[key] = dict(rel_data)
+            return
+        self.duplicate_relationships += 1
+        what = f"relationship ({key[0]})-[:{key[1]}]->({key[2]})"
+        self._merge_properties(existing, rel_data, what)
+
+    def node_labels(self, node_id: Any) -> Optional[List[str]]:
+        """Return the merged labels of a node, or None if it is unknown."""
+        entry = self.nodes.get(node_id)
+        return entry[0] if entry is not None else None
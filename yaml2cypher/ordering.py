@@ -0,0 +1,110 @@
+import heapq
+import json
+import os
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Default amount of statement text buffered before a sorted run is spilled.
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Rough per-entry bookkeeping cost on top of the statement text.
+_ENTRY_OVERHEAD = 96
+
+SortKey = Tuple[Any, ...]
+
+RELATIONSHIP_ORDERS = ("source", "type_source")
+
+
+class ExternalSorter:
+    """Sort (key, statement) pairs, spilling sorted runs to disk.
+
+    Entries are buffered until their estimated size exceeds the memory
+    budget, at which point the buffer is sorted and written to a temporary
+    file as one JSON record per line. Iterating the sorter merges the
+    spilled runs with the in-memory remainder and then deletes the spill
+    files; call :meth:`close`, or use the sorter as a context manager, to
+    delete them when the sorter is abandoned before it is iterated. Entries
+    with equal keys keep their insertion order. Keys must be tuples of ints
+    and strings.
+    """
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        tmp_dir: Optional[str] = None,
+    ) -> None:
+        """Initialize the sorter.
+
+        Args:
+            memory_budget: Approximate number of bytes to buffer in memory
+            tmp_dir: Directory for spill files (default: system temp dir)
+        """
+        self.memory_budget = memory_budget
+        self.tmp_dir = tmp_dir
+        self._buffer: List[Tuple[SortKey, str]] = []
+        self._buffered_bytes = 0
+        self._runs: List[str] = []
+        self._seq = 0
+
+    @property
+    def spill_count(self) -> int:
+        """Number of sorted runs written to disk so far."""
+        return len(self._runs)
+
+    def add(self, key: SortKey, statement: str) -> None:
+        """Add a statement with its sort key.
+
+        Args:
+            key: Tuple of ints and strings to sort by
+            statement: Statement to emit in key order
+        """
+        self._buffer.append((key + (self._seq,), statement))
+        self._seq += 1
+        self._buffered_bytes += len(statement) + _ENTRY_OVERHEAD
+        if self._buffered_bytes > self.memory_budget:
+            self._spill()
+
+    def _spill(self) -> None:
+        import tempfile
+
+        self._buffer.sort()
+        fd, path = tempfile.mkstemp(
+            prefix="yaml2cypher-sort-", suffix=".jsonl", dir=self.tmp_dir
+        )
+        with os.fdopen(fd, "w") as f:
+            for key, statement in self._buffer:
+                f.write(json.dumps([key, statement]))
+                f.write("\n")
+        self._runs.append(path)
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple[SortKey, str]]:
+        with open(path, "r") as f:
+            for line in f:
+                key, statement = json.loads(line)
+                yield tuple(key), statement
+
+    def __iter__(self) -> Iterator[str]:
+        self._buffer.sort()
+        runs = [self._read_run(path) for path in self._runs]
+        try:
+            for _, statement in heapq.merge(iter(self._buffer), *runs):
+                yield statement
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Delete the spill files and drop every buffered entry."""
+        for path in self._runs:
+            if os.path.exists(path):
+                os.unlink(path)
+        self._runs = []
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,401 @@
+"""Schema inference and typed columnar property tables.
+
+:func:`infer_schema` samples the nodes of every label set and the
+relationships of every type and records, per property, which value types
+occur, how often the property is missing or null, and the element types of
+list values. The result can be printed as a report to review type drift.
+
+:class:`ColumnTable` stores the properties of one group of elements column
+by column in typed ``array`` columns chosen from that schema, so the batched
+and bulk backends can format a whole column at once instead of dispatching
+on the type of every value.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+DEFAULT_SAMPLE_SIZE = 1000
+
+# Column kinds with a typed storage class
+_ARRAY_CODES = {"integer": "q", "float": "d", "boolean": "b"}
+
+# Row states kept per column
+_ABSENT, _PRESENT, _NULL = 0, 1, 2
+
+
+def value_type(value: Any) -> str:
+    """Return the schema type name of a property value.
+
+    Args:
+        value: Property value
+
+    Returns:
+        One of ``null``, ``boolean``, ``integer``, ``float``, ``string``,
+        ``list``, ``map`` or the Python type name for anything else
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "list"
+    if isinstance(value, dict):
+        return "map"
+    return type(value).__name__
+
+
+class PropertySchema:
+    """Observed types of one property."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.element_types: Dict[str, int] = {}
+
+    def observe(self, value: Any) -> None:
+        """Record one value of the property."""
+        self.count += 1
+        kind = value_type(value)
+        self.types[kind] = self.types.get(kind, 0) + 1
+        if kind == "list":
+            for item in value:
+                item_kind = value_type(item)
+                self.element_types[item_kind] = (
+                    self.element_types.get(item_kind, 0) + 1
+                )
+
+    @property
+    def value_types(self) -> List[str]:
+        """Non-null types seen, most frequent first."""
+        return sorted(
+            (kind for kind in self.types if kind != "null"),
+            key=lambda kind: -self.types[kind],
+        )
+
+    @property
+    def column_kind(self) -> str:
+        """Storage kind for a column of this property.
+
+        A single scalar type maps to a typed column; anything mixed or
+        nested is stored as a generic ``object`` column.
+        """
+        kinds = self.value_types
+        if len(kinds) == 1 and kinds[0] in (
+            "integer",
+            "float",
+            "boolean",
+            "string",
+        ):
+            return kinds[0]
+        return "object"
+
+
+class ElementSchema:
+    """Schema of the nodes of one label set, or relationships of one type."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sampled = 0
+        self.properties: Dict[str, PropertySchema] = {}
+
+    def observe(self, properties: Dict[str, Any], sample: bool) -> None:
+        """Record one element.
+
+        Property names are always recorded, so the key set is complete;
+        value types are only taken from sampled elements.
+
+        Args:
+            properties: The element's properties
+            sample: Whether the element's values are sampled
+        """
+        self.count += 1
+        if not sample:
+            for key in properties:
+                if key not in self.properties:
+                    self.properties[key] = PropertySchema()
+            return
+        self.sampled += 1
+        for key, value in properties.items():
+            prop = self.properties.get(key)
+            if prop is None:
+                prop = self.properties[key] = PropertySchema()
+            prop.observe(value)
+
+    def nullable(self, key: str) -> bool:
+        """Whether a property was missing or null in any sampled element."""
+        prop = self.properties[key]
+        return prop.count < self.sampled or "null" in prop.types
+
+
+class GraphSchema:
+    """Inferred schema of a whole graph."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[Tuple[str, ...], ElementSchema] = {}
+        self.relationships: Dict[str, ElementSchema] = {}
+
+    def drift(self) -> List[str]:
+        """Describe properties that hold values of more than one type."""
+        found = []
+        for name, element in self._groups():
+            for key, prop in element.properties.items():
+                if len(prop.value_types) > 1:
+                    found.append(
+                        f"{name}.{key}: {', '.join(prop.value_types)}"
+                    )
+        return found
+
+    def _groups(self) -> Iterable[Tuple[str, ElementSchema]]:
+        for labels, element in self.nodes.items():
+            label_str = "".join(f":{label}" for label in labels)
+            yield f"({label_str})", element
+        for rel_type, element in self.relationships.items():
+            yield f"[:{rel_type}]", element
+
+    def report(self) -> str:
+        """Format the schema as a human-readable report."""
+        lines = []
+        for name, element in self._groups():
+            lines.append(
+                f"{name} {element.count} element(s), "
+                f"{element.sampled} sampled"
+            )
+            for key, prop in element.properties.items():
+                kinds = "|".join(prop.value_types) or "null"
+                if prop.element_types:
+                    items = "|".join(sorted(prop.element_types))
+                    kinds = kinds.replace("list", f"list<{items}>")
+                nullable = " (nullable)" if element.nullable(key) else ""
+                lines.append(f"  {key}: {kinds}{nullable}")
+        drift = self.drift()
+        if drift:
+            lines.append("Type drift:")
+            lines.extend(f"  {entry}" for entry in drift)
+        return "\n".join(lines)
+
+
+def _node_labels(node_data: Dict[str, Any]) -> Tuple[str, ...]:
+    labels = node_data.get("labels", [])
+    if isinstance(labels, str):
+        labels = [labels]
+    return tuple(labels)
+
+
+def infer_schema(
+    yaml_data: Dict[str, Any], sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> GraphSchema:
+    """Infer the schema of parsed graph data.
+
+    The first ``sample_size`` elements of every label set and relationship
+    type are inspected; the rest are only counted.
+
+    Args:
+        yaml_data: Parsed graph data
+        sample_size: Elements sampled per group
+
+    Returns:
+        The inferred schema
+    """
+    schema = GraphSchema()
+    for node_data in (yaml_data.get("nodes") or {}).values():
+        element = schema.nodes.setdefault(
+            _node_labels(node_data), ElementSchema()
+        )
+        element.observe(
+            {k: v for k, v in node_data.items() if k != "labels"},
+            element.count < sample_size,
+        )
+    for rel_data in yaml_data.get("relationships") or []:
+        element = schema.relationships.setdefault(
+            str(rel_data.get("type")), ElementSchema()
+        )
+        element.observe(
+            {
+                k: v
+                for k, v in rel_data.items()
+                if k not in ("from", "to", "type")
+            },
+            element.count < sample_size,
+        )
+    return schema
+
+
+class Column:
+    """One property stored for every row of a :class:`ColumnTable`."""
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.values: Any = (
+            array(_ARRAY_CODES[kind]) if kind in _ARRAY_CODES else []
+        )
+        self.state = bytearray()
+
+    def _demote(self) -> None:
+        """Fall back to a generic column after an unexpected value."""
+        if self.kind == "boolean":
+            self.values = [bool(v) for v in self.values]
+        else:
+            self.values = list(self.values)
+        self.kind = "object"
+
+    def append(self, present: bool, value: Any) -> None:
+        """Append the value of the next row."""
+        if not present or value is None:
+            self.state.append(_NULL if present else _ABSENT)
+            self.values.append(0 if self.kind in _ARRAY_CODES else None)
+            return
+        if self.kind != "object" and value_type(value) != self.kind:
+            self._demote()
+        try:
+            self.values.append(value)
+        except OverflowError:
+            # Integer outside the 64-bit range of the typed column
+            self._demote()
+            self.values.append(value)
+        self.state.append(_PRESENT)
+
+    def format_csv(self, format_value: Callable[[Any], str]) -> List[str]:
+        """Format every value of the column as a CSV field in one pass.
+
+        Args:
+            format_value: Formatter for generic ``object`` columns
+
+        Returns:
+            Field values, with an empty string for null or missing values
+        """
+        if self.kind in ("integer", "float"):
+            formatted = list(
+                map(str if self.kind == "integer" else repr, self.values)
+            )
+        elif self.kind == "boolean":
+            formatted = ["true" if v else "false" for v in self.values]
+        elif self.kind == "string":
+            formatted = [v if v is not None else "" for v in self.values]
+        else:
+            formatted = [
+                format_value(v) if state == _PRESENT else ""
+                for v, state in zip(self.values, self.state)
+            ]
+        for i, state in enumerate(self.state):
+            if state != _PRESENT:
+                formatted[i] = ""
+        return formatted
+
+    def format(self, format_value: Callable[[Any], str]) -> List[str]:
+        """Format every value of the column to Cypher in one pass.
+
+        Args:
+            format_value: Formatter for generic ``object`` columns
+
+        Returns:
+            Formatted values, with ``null`` for null rows and an empty
+            string for rows without the property
+        """
+        if self.kind == "integer":
+            formatted = list(map(str, self.values))
+        elif self.kind == "float":
+            formatted = list(map(repr, self.values))
+        elif self.kind == "boolean":
+            formatted = ["true" if v else "false" for v in self.values]
+        elif self.kind == "string":
+            formatted = [
+                "'" + v.replace("'", "\\'") + "'" if v is not None else ""
+                for v in self.values
+            ]
+        else:
+            formatted = [
+                format_value(v) if state == _PRESENT else ""
+                for v, state in zip(self.values, self.state)
+            ]
+        for i, state in enumerate(self.state):
+            if state == _NULL:
+                formatted[i] = "null"
+        return formatted
+
+
+class ColumnTable:
+    """Properties of a group of elements stored column by column."""
+
+    def __init__(
+        self,
+        schema: ElementSchema,
+        overrides: Iterable[str] = (),
+    ) -> None:
+        """Create an empty table for the properties in a schema.
+
+        Args:
+            schema: Inferred schema of the group
+            overrides: Property names to store as ``object`` columns
+                regardless of their inferred type
+        """
+        forced = set(overrides)
+        self.columns: Dict[str, Column] = {
+            key: Column("object" if key in forced else prop.column_kind)
+            for key, prop in schema.properties.items()
+        }
+        self.rows = 0
+
+    def append(self, properties: Dict[str, Any]) -> None:
+        """Append one element's properties as a new row."""
+        for key in properties:
+            if key not in self.columns:
+                # Property first seen after the sample
+                column = self.columns[key] = Column("object")
+                for _ in range(self.rows):
+                    column.append(False, None)
+        for key, column in self.columns.items():
+            column.append(key in properties, properties.get(key))
+        self.rows += 1
+
+    def format_csv_columns(
+        self, names: Iterable[str], format_value: Callable[[Any], str]
+    ) -> List[List[str]]:
+        """Format the named columns as CSV fields.
+
+        Args:
+            names: Column names, in output order
+            format_value: Formatter for generic ``object`` columns
+
+        Returns:
+            One list of field values per column
+        """
+        return [self.columns[name].format_csv(format_value) for name in names]
+
+    def format_rows(
+        self,
+        format_value: Callable[[Any], str],
+        column_formatters: Dict[str, Callable[[Any], str]],
+    ) -> List[str]:
+        """Format every row as a Cypher map literal.
+
+        Args:
+            format_value: Formatter for generic ``object`` columns
+            column_formatters: Formatters for specific columns
+
+        Returns:
+            One ``{key: value, ...}`` string per row, or an empty string
+            for rows without properties
+        """
+        formatted = [
+            (
+                key,
+                column.format(column_formatters.get(key, format_value)),
+                column.state,
+            )
+            for key, column in self.columns.items()
+        ]
+        rows = []
+        for i in range(self.rows):
+            parts = [
+                f"{key}: {values[i]}"
+                for key, values, state in formatted
+                if state[i] != _ABSENT
+            ]
+            rows.append(f"{{{', '.join(parts)}}}" if parts else "")
+        return rows
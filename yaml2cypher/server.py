@@ -0,0 +1,161 @@
+"""Resident conversion server and thin client over a Unix socket.
+
+Starting the interpreter and importing PyYAML dominate the runtime of small
+conversions. ``yaml2cypher --serve SOCKET`` keeps a process running that
+owns warm converters and a parsed-file cache, and ``yaml2cypher --server
+SOCKET FILE`` hands the conversion to it. Each connection carries one JSON
+request line and receives one JSON response line.
+"""
+
+import json
+import os
+import socket
+from typing import Any, Dict, Optional
+
+# Upper bound on the size of a single request or response line.
+_MAX_MESSAGE = 1024 * 1024
+
+
+def _recv_line(sock: socket.socket) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if b"\n" in chunk or size > _MAX_MESSAGE:
+            break
+    return b"".join(chunks).split(b"\n", 1)[0]
+
+
+def _send_json(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+class ConversionServer:
+    """Serve conversion requests on a Unix domain socket."""
+
+    def __init__(self, socket_path: str, cache_size: int = 128) -> None:
+        """Initialize the server.
+
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            cache_size: Maximum number of parsed files kept in memory
+        """
+        from yaml2cypher.loaders import FileCache
+
+        self.socket_path = socket_path
+        self.file_cache = FileCache(cache_size)
+        self._converters: Dict[str, Any] = {}
+        self._running = False
+
+    def _converter(self, config: Dict[str, Any]) -> Any:
+        """Return a warm converter for a configuration."""
+        from yaml2cypher.converter import YAML2Cypher
+
+        key = json.dumps(config, sort_keys=True)
+        converter = self._converters.get(key)
+        if converter is None:
+            converter = YAML2Cypher(config)
+            converter.file_cache = self.file_cache
+            converter.document_cache.max_entries = self.file_cache.max_entries
+            self._converters[key] = converter
+        return converter
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Process a single request.
+
+        Args:
+            request: Decoded request with ``input``, ``output`` and
+                ``config``, or ``{"command": "shutdown"}``
+
+        Returns:
+            Response with ``ok`` and either ``statements`` or ``error``
+        """
+        if request.get("command") == "shutdown":
+            self._running = False
+            return {"ok": True}
+        try:
+            converter = self._converter(request.get("config", {}))
+            statements = converter.yaml_file_to_cypher(request["input"])
+            converter.write_cypher_to_file(statements, request["output"])
+            return {"ok": True, "statements": len(statements)}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def serve_forever(self) -> None:
+        """Accept and process requests until a shutdown request arrives."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            listener.listen()
+            self._running = True
+            while self._running:
+                conn, _ = listener.accept()
+                with conn:
+                    try:
+                        request = json.loads(_recv_line(conn))
+                    except ValueError as e:
+                        response = {"ok": False, "error": f"bad request: {e}"}
+                    else:
+                        response = self.handle(request)
+                    _send_json(conn, response)
+        finally:
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def request_conversion(
+    socket_path: str,
+    input_file: str,
+    output_file: str,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Ask a running server to convert a file.
+
+    Args:
+        socket_path: Filesystem path of the server's Unix socket
+        input_file: Path to the input file
+        output_file: Path to the output Cypher file
+        config: Converter configuration
+
+    Returns:
+        The server's response
+
+    Raises:
+        OSError: If the server cannot be reached
+    """
+    return _request(
+        socket_path,
+        {
+            "input": os.path.abspath(input_file),
+            "output": os.path.abspath(output_file),
+            "config": config or {},
+        },
+    )
+
+
+def request_shutdown(socket_path: str) -> Dict[str, Any]:
+    """Ask a running server to exit.
+
+    Args:
+        socket_path: Filesystem path of the server's Unix socket
+
+    Returns:
+        The server's response
+    """
+    return _request(socket_path, {"command": "shutdown"})
+
+
+def _request(socket_path: str, message: Dict[str, Any]) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        _send_json(sock, message)
+        response: Dict[str, Any] = json.loads(_recv_line(sock))
+    return response
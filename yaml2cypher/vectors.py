@@ -0,0 +1,67 @@
+from array import array
+from typing import Any, Optional
+
+
+def is_numpy_array(value: Any) -> bool:
+    """Check for a NumPy array without importing NumPy.
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if the value is a ``numpy.ndarray``
+    """
+    value_type = type(value)
+    return (
+        value_type.__name__ == "ndarray"
+        and value_type.__module__ == "numpy"
+    )
+
+
+def is_vector(value: Any) -> bool:
+    """Check whether a value is a vector by its type.
+
+    Float ``array.array`` instances and NumPy arrays are vectors; plain
+    lists only become vectors through a schema hint.
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if the value should be emitted as a vector literal
+    """
+    if isinstance(value, array):
+        return value.typecode in ("f", "d")
+    return is_numpy_array(value)
+
+
+def format_vector(values: Any, precision: Optional[int] = None) -> str:
+    """Format a sequence of numbers as a FalkorDB ``vecf32`` literal.
+
+    The values are converted to floats in bulk (``ndarray.tolist`` for
+    NumPy input, ``array('d', ...)`` otherwise) instead of being
+    dispatched one by one through the generic property formatter.
+
+    Args:
+        values: List, ``array.array`` or NumPy array of numbers
+        precision: Significant digits per element, or None for the
+            shortest representation that round-trips
+
+    Returns:
+        Formatted ``vecf32([...])`` expression
+
+    Raises:
+        TypeError: If the values are not all numbers
+    """
+    if is_numpy_array(values):
+        floats = values.astype("float64").ravel().tolist()
+    elif isinstance(values, array) and values.typecode == "d":
+        floats = values
+    else:
+        floats = array("d", values)
+
+    if precision is None:
+        items = map(repr, floats)
+    else:
+        items = map(f"%.{precision}g".__mod__, floats)
+    return f"vecf32([{', '.join(items)}])"
@@ -0,0 +1,266 @@
+"""Watch a directory and reconvert graph files when they change.
+
+Files are detected as changed by comparing their modification time and size
+between polls. When the optional ``inotify_simple`` package is installed the
+watcher sleeps on inotify events instead of a fixed interval. Changed files
+are parsed through a bounded :class:`~yaml2cypher.loaders.FileCache`, and
+statements of nodes and relationships whose data did not change are reused
+from the previous conversion of the same file. Files pulled in through
+``include:`` are tracked too, so editing one reconverts the files that
+include it.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from yaml2cypher import loaders
+from yaml2cypher.converter import YAML2Cypher
+
+WATCHED_EXTENSIONS = (
+    loaders.YAML_EXTENSIONS
+    + loaders.JSON_EXTENSIONS
+    + loaders.NDJSON_EXTENSIONS
+)
+
+
+class ElementCache:
+    """Statements of one file's elements from its previous conversion."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[Any, Tuple[Dict[str, Any], str]] = {}
+        self.relationships: Dict[Tuple[Any, ...], List[Tuple[Any, str]]] = {}
+        self.output: Optional[List[str]] = None
+
+
+class IncrementalConverter(YAML2Cypher):
+    """Converter that reuses statements of unchanged elements.
+
+    Before converting a file, :attr:`elements` is pointed at that file's
+    :class:`ElementCache`. Nodes are matched by id and relationships by
+    (from, to, type); a cached statement is reused when the element data
+    compares equal to the data it was generated from.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(config)
+        self.elements = ElementCache()
+        self._next = ElementCache()
+        self.reused = 0
+        self.converted = 0
+
+    def begin(self, elements: ElementCache) -> None:
+        """Start converting a file whose previous elements are cached.
+
+        Args:
+            elements: Cache filled by the previous conversion of the file
+        """
+        self.elements = elements
+        self._next = ElementCache()
+        self.reused = 0
+        self.converted = 0
+
+    def finish(self) -> ElementCache:
+        """Finish a file and return the cache for its next conversion."""
+        return self._next
+
+    def _convert_node(self, node_id: str, node_data: Dict[str, Any]) -> str:
+        cached = self.elements.nodes.get(node_id)
+        if cached is not None and cached[0] == node_data:
+            statement = cached[1]
+            self.reused += 1
+        else:
+            statement = super()._convert_node(node_id, node_data)
+            self.converted += 1
+        self._next.nodes[node_id] = (node_data, statement)
+        return statement
+
+    def _convert_relationship(self, rel_data: Dict[str, Any]) -> str:
+        key = (rel_data.get("from"), rel_data.get("to"), rel_data.get("type"))
+        statement = None
+        for data, cached_statement in self.elements.relationships.get(
+            key, ()
+        ):
+            if data == rel_data:
+                statement = cached_statement
+                self.reused += 1
+                break
+        if statement is None:
+            statement = super()._convert_relationship(rel_data)
+            self.converted += 1
+        self._next.relationships.setdefault(key, []).append(
+            (rel_data, statement)
+        )
+        return statement
+
+
+class Watcher:
+    """Poll a directory and reconvert graph files that changed."""
+
+    def __init__(
+        self,
+        directory: str,
+        config: Optional[Dict[str, Any]] = None,
+        interval: float = 1.0,
+        cache_size: int = 128,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            directory: Directory to watch recursively
+            config: Converter configuration
+            interval: Seconds between polls
+            cache_size: Maximum number of files whose parsed content and
+                element statements are kept in memory
+        """
+        self.directory = directory
+        self.interval = interval
+        self.cache_size = cache_size
+        self.file_cache = loaders.FileCache(cache_size)
+        self.converter = IncrementalConverter(config)
+        self.converter.file_cache = self.file_cache
+        self.converter.document_cache.max_entries = cache_size
+        self.logger = self.converter.logger
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        # Files included by each watched file, and their last signatures
+        self._includes: Dict[str, Set[str]] = {}
+        self._include_signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._elements: "OrderedDict[str, ElementCache]" = OrderedDict()
+        self._inotify: Any = None
+
+    @staticmethod
+    def output_path(path: str) -> str:
+        """Return the Cypher output path for an input file."""
+        return f"{os.path.splitext(path)[0]}.cypher"
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def scan(self) -> List[str]:
+        """Return the watched files that are new or changed since last scan.
+
+        A file also counts as changed when a file it includes changed, even
+        one outside the watched directory.
+
+        Returns:
+            Paths of changed files, in sorted order
+        """
+        changed = []
+        seen = set()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.lower().endswith(WATCHED_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._signatures.get(path) != signature:
+                    self._signatures[path] = signature
+                    changed.append(path)
+        for path in set(self._signatures) - seen:
+            del self._signatures[path]
+            self._elements.pop(path, None)
+            self._includes.pop(path, None)
+            self.file_cache.discard(path)
+
+        dependents: Dict[str, List[str]] = {}
+        for path, included in self._includes.items():
+            for include in included:
+                dependents.setdefault(include, []).append(path)
+        for include in set(self._include_signatures) - set(dependents):
+            del self._include_signatures[include]
+        for include, paths in dependents.items():
+            include_signature = self._signature(include)
+            if self._include_signatures.get(include) != include_signature:
+                self._include_signatures[include] = include_signature
+                changed.extend(paths)
+        return sorted(set(changed))
+
+    def convert(self, path: str) -> bool:
+        """Reconvert one file, rewriting its output only if it changed.
+
+        Args:
+            path: Path to the input file
+
+        Returns:
+            True if the output file was written
+        """
+        elements = self._elements.pop(path, None) or ElementCache()
+        self.converter.begin(elements)
+        try:
+            statements = self.converter.yaml_file_to_cypher(path)
+        except Exception as e:
+            self.logger.error(f"Error converting {path}: {e}")
+            self._elements[path] = elements
+            return False
+        included = self.converter.included_files
+        self._includes[path] = included
+        for include in included:
+            if include not in self._include_signatures:
+                self._include_signatures[include] = self._signature(include)
+        next_elements = self.converter.finish()
+        next_elements.output = statements
+        self._elements[path] = next_elements
+        while len(self._elements) > self.cache_size:
+            self._elements.popitem(last=False)
+
+        self.logger.info(
+            f"{path}: {self.converter.converted} element(s) converted, "
+            f"{self.converter.reused} reused"
+        )
+        if elements.output == statements:
+            return False
+        self.converter.write_cypher_to_file(
+            statements, self.output_path(path)
+        )
+        return True
+
+    def poll_once(self) -> List[str]:
+        """Scan once and reconvert every changed file.
+
+        Returns:
+            Paths of the files whose output was rewritten
+        """
+        return [path for path in self.scan() if self.convert(path)]
+
+    def _wait(self) -> None:
+        """Sleep until the next poll, waking early on inotify events."""
+        if self._inotify is None:
+            try:
+                from inotify_simple import INotify, flags  # type: ignore
+            except ImportError:
+                self._inotify = False
+            else:
+                self._inotify = INotify()
+                mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+                mask |= flags.DELETE
+                for root, _, _ in os.walk(self.directory):
+                    self._inotify.add_watch(root, mask)
+        if self._inotify:
+            self._inotify.read(timeout=int(self.interval * 1000))
+        else:
+            time.sleep(self.interval)
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """Watch the directory until interrupted.
+
+        Args:
+            max_polls: Stop after this many polls (default: run forever)
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            for path in self.poll_once():
+                print(f"Converted {path} to {self.output_path(path)}")
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                self._wait()